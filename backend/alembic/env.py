@@ -8,7 +8,7 @@ import sys
 # Add backend/ to PYTHONPATH so "app" becomes importable
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
 
-from app.core.db import Base, DATABASE_URL
+from app.core.db import Base, SYNC_URL
 from app.models.ml import ModelRun, Forecast, ElasticityEstimate, PriceRecommendation
 from app.models.product import Product
 from app.models.sales import RawSales, SalesDaily, Cost
@@ -17,8 +17,9 @@ from app.models.org import Organization
 # Alembic Config object
 config = context.config
 
-# Override URL from db.py
-config.set_main_option("sqlalchemy.url", DATABASE_URL)
+# Override URL from db.py (config values are strings; % must be escaped for configparser)
+DATABASE_URL = SYNC_URL.render_as_string(hide_password=False)
+config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
 
 # Interpret logging
 if config.config_file_name is not None:
@@ -0,0 +1,118 @@
+"""create base tables
+
+Revision ID: 0b7e3f9a1c24
+Revises:
+Create Date: 2026-10-14 16:20:41.508913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e3f9a1c24'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The tables as they were before 98686f11de1d, which used to come from create_all
+# at startup: later revisions add raw_sales.error_message, the sales_daily
+# (product_id, date) unique constraint and the server defaults on top of these,
+# so an empty database can run the whole chain.
+
+
+def upgrade() -> None:
+    op.create_table(
+        "organizations",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "products",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("org_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("sku", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("currency", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "raw_sales",
+        sa.Column("raw_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=False),
+        sa.Column("source", sa.String(), nullable=True),
+        sa.Column("raw_json", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+    )
+    op.create_table(
+        "sales_daily",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("units_sold", sa.Integer(), nullable=False),
+        sa.Column("price", sa.Numeric(), nullable=False),
+        sa.Column("revenue", sa.Numeric(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_table(
+        "costs",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("unit_cost", sa.Numeric(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_table(
+        "model_runs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("model_name", sa.String(), nullable=False),
+        sa.Column("model_version", sa.String(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        "forecasts",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("model_run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("model_runs.id"), nullable=False),
+        sa.Column("target_date", sa.Date(), nullable=False),
+        sa.Column("predicted_units", sa.Numeric(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_table(
+        "elasticity_estimates",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("model_run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("model_runs.id"), nullable=False),
+        sa.Column("window_start", sa.Date(), nullable=False),
+        sa.Column("window_end", sa.Date(), nullable=False),
+        sa.Column("elasticity", sa.Numeric(), nullable=False),
+        sa.Column("r2", sa.Numeric(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_table(
+        "price_recommendations",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("model_run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("model_runs.id"), nullable=False),
+        sa.Column("target_date", sa.Date(), nullable=False),
+        sa.Column("objective", sa.String(), nullable=False),
+        sa.Column("suggested_price", sa.Numeric(), nullable=False),
+        sa.Column("expected_units", sa.Numeric(), nullable=False),
+        sa.Column("expected_revenue", sa.Numeric(), nullable=False),
+        sa.Column("expected_profit", sa.Numeric(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        "price_recommendations", "elasticity_estimates", "forecasts", "model_runs",
+        "costs", "sales_daily", "raw_sales", "products", "organizations",
+    ):
+        op.drop_table(table)
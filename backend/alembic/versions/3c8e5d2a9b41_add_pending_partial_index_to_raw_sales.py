@@ -0,0 +1,34 @@
+"""add partial index on pending raw_sales rows
+
+Revision ID: 3c8e5d2a9b41
+Revises: f1df74e93c99
+Create Date: 2026-10-14 09:12:05.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e5d2a9b41'
+down_revision: Union[str, None] = 'f1df74e93c99'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the ETL extract (status='pending' ... FOR UPDATE SKIP LOCKED);
+    # only pending rows are indexed so it stays small as history grows.
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_raw_sales_pending "
+            "ON raw_sales (raw_id) WHERE status = 'pending'"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_raw_sales_pending")
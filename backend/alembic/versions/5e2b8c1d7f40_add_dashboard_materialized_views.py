@@ -0,0 +1,66 @@
+"""add dashboard materialized views
+
+Revision ID: 5e2b8c1d7f40
+Revises: 7a1d4f6e2c93
+Create Date: 2026-10-14 11:18:05.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b8c1d7f40'
+down_revision: Union[str, None] = '7a1d4f6e2c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Pre-aggregated sales_daily for the dashboard endpoints, refreshed by
+# `python -m app.etl.refresh_views`. Each view carries a unique index so it can be
+# refreshed CONCURRENTLY, and a refreshed_at column the API reports as staleness.
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_sales_daily_totals AS
+        SELECT 1 AS id,
+               COALESCE(SUM(units_sold), 0) AS total_units_sold,
+               COALESCE(SUM(revenue), 0) AS total_revenue,
+               now() AS refreshed_at
+        FROM sales_daily
+    """)
+    op.execute("CREATE UNIQUE INDEX ux_mv_sales_daily_totals_id ON mv_sales_daily_totals (id)")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_sales_by_date AS
+        SELECT date,
+               SUM(units_sold) AS units_sold,
+               SUM(revenue) AS revenue,
+               now() AS refreshed_at
+        FROM sales_daily
+        GROUP BY date
+    """)
+    op.execute("CREATE UNIQUE INDEX ux_mv_sales_by_date_date ON mv_sales_by_date (date)")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_top_products AS
+        SELECT p.id AS product_id,
+               p.name,
+               SUM(s.units_sold) AS units_sold,
+               SUM(s.revenue) AS revenue,
+               AVG(s.price) AS avg_price,
+               now() AS refreshed_at
+        FROM sales_daily s
+        JOIN products p ON p.id = s.product_id
+        GROUP BY p.id, p.name
+    """)
+    op.execute("CREATE UNIQUE INDEX ux_mv_top_products_product_id ON mv_top_products (product_id)")
+    op.execute("CREATE INDEX ix_mv_top_products_revenue ON mv_top_products (revenue DESC)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_top_products")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_sales_by_date")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_sales_daily_totals")
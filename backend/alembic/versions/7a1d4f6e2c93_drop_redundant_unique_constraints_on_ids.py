@@ -0,0 +1,58 @@
+"""drop redundant unique constraints on primary key ids
+
+Revision ID: 7a1d4f6e2c93
+Revises: 3c8e5d2a9b41
+Create Date: 2026-10-14 10:02:47.531804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1d4f6e2c93'
+down_revision: Union[str, None] = '3c8e5d2a9b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# id is already the primary key on these tables; a unique constraint on it
+# only adds a second identical index to maintain on every write
+TABLES = ("model_runs", "organizations", "products")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table in TABLES:
+        # The init migration created these unnamed, so look the names up
+        uniques = conn.execute(sa.text("""
+            SELECT con.conname, con.conindid
+            FROM pg_constraint con
+            JOIN pg_attribute att
+              ON att.attrelid = con.conrelid AND att.attnum = con.conkey[1]
+            WHERE con.conrelid = CAST(:table AS regclass)
+              AND con.contype = 'u'
+              AND array_length(con.conkey, 1) = 1
+              AND att.attname = 'id'
+        """), {"table": table}).all()
+
+        for unique_name, index_oid in uniques:
+            # Foreign keys created after the unique constraint may be bound to its
+            # index instead of the primary key; re-create them so they use the PK
+            fks = conn.execute(sa.text("""
+                SELECT CAST(conrelid AS regclass)::text, conname, pg_get_constraintdef(oid)
+                FROM pg_constraint
+                WHERE contype = 'f' AND conindid = :index_oid
+            """), {"index_oid": index_oid}).all()
+
+            for fk_table, fk_name, _ in fks:
+                op.drop_constraint(fk_name, fk_table, type_="foreignkey")
+            op.drop_constraint(unique_name, table, type_="unique")
+            for fk_table, fk_name, fk_definition in fks:
+                op.execute(f'ALTER TABLE {fk_table} ADD CONSTRAINT "{fk_name}" {fk_definition}')
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.create_unique_constraint(f"{table}_id_key", table, ["id"])
@@ -1,7 +1,7 @@
 """init schema
 
 Revision ID: 98686f11de1d
-Revises: 
+Revises: 0b7e3f9a1c24
 Create Date: 2025-08-18 13:47:06.146215
 
 """
@@ -12,16 +12,14 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision: str = '98686f11de1d'
-down_revision: Union[str, None] = None
+down_revision: Union[str, None] = '0b7e3f9a1c24'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Keep the unique constraints
-    op.create_unique_constraint(None, 'model_runs', ['id'])
-    op.create_unique_constraint(None, 'organizations', ['id'])
-    op.create_unique_constraint(None, 'products', ['id'])
+    # No unique constraints on model_runs/organizations/products ids:
+    # id is already the primary key (see 7a1d4f6e2c93)
 
     op.alter_column(
         "products",
@@ -40,6 +38,3 @@ def downgrade() -> None:
         existing_type="TIMESTAMP",
         existing_nullable=False,
     )
-    op.drop_constraint(None, 'products', type_='unique')
-    op.drop_constraint(None, 'organizations', type_='unique')
-    op.drop_constraint(None, 'model_runs', type_='unique')
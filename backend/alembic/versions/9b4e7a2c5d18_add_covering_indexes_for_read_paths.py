@@ -0,0 +1,41 @@
+"""add covering indexes for elasticity and raw sales listing
+
+Revision ID: 9b4e7a2c5d18
+Revises: 5e2b8c1d7f40
+Create Date: 2026-10-14 12:41:36.907215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e7a2c5d18'
+down_revision: Union[str, None] = '5e2b8c1d7f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    # estimate_elasticity / forecasting: product_id = ? AND date in range. The unique
+    # constraint already orders by (product_id, date); INCLUDE makes it index-only.
+    "ix_sales_daily_product_date":
+        "ON sales_daily (product_id, date) INCLUDE (price, units_sold, revenue)",
+    # Dashboard raw-sales listing, with and without a status filter
+    "ix_raw_sales_status_uploaded_at": "ON raw_sales (status, uploaded_at DESC)",
+    "ix_raw_sales_uploaded_at": "ON raw_sales (uploaded_at DESC)",
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,38 @@
+"""add partial indexes for processed and failed raw_sales rows
+
+Revision ID: c6f1a8e3b207
+Revises: 9b4e7a2c5d18
+Create Date: 2026-10-14 13:27:52.118640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1a8e3b207'
+down_revision: Union[str, None] = '9b4e7a2c5d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ix_raw_sales_pending already exists (3c8e5d2a9b41); together they let each
+# per-status COUNT in etl_status / dashboard stats run as an index-only scan
+STATUSES = ("processed", "failed")
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for status in STATUSES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_raw_sales_{status} "
+                f"ON raw_sales (raw_id) WHERE status = '{status}'"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for status in STATUSES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_raw_sales_{status}")
@@ -0,0 +1,69 @@
+"""aggregate sales before joining products in mv_top_products
+
+Revision ID: d2a9c4f7e815
+Revises: c6f1a8e3b207
+Create Date: 2026-10-14 14:05:19.662374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a9c4f7e815'
+down_revision: Union[str, None] = 'c6f1a8e3b207'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Group sales_daily by product_id alone, then join products for the name: the
+# aggregation no longer carries products.name through the hash/sort, and the join
+# runs once per product instead of once per sales row
+AGGREGATE_THEN_JOIN = """
+    CREATE MATERIALIZED VIEW mv_top_products AS
+    SELECT s.product_id,
+           p.name,
+           s.units_sold,
+           s.revenue,
+           s.avg_price,
+           now() AS refreshed_at
+    FROM (
+        SELECT product_id,
+               SUM(units_sold) AS units_sold,
+               SUM(revenue) AS revenue,
+               AVG(price) AS avg_price
+        FROM sales_daily
+        GROUP BY product_id
+    ) s
+    JOIN products p ON p.id = s.product_id
+"""
+
+JOIN_THEN_AGGREGATE = """
+    CREATE MATERIALIZED VIEW mv_top_products AS
+    SELECT p.id AS product_id,
+           p.name,
+           SUM(s.units_sold) AS units_sold,
+           SUM(s.revenue) AS revenue,
+           AVG(s.price) AS avg_price,
+           now() AS refreshed_at
+    FROM sales_daily s
+    JOIN products p ON p.id = s.product_id
+    GROUP BY p.id, p.name
+"""
+
+
+def _recreate(definition: str) -> None:
+    # DDL is transactional, so readers see the old view until this commits
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_top_products")
+    op.execute(definition)
+    op.execute("CREATE UNIQUE INDEX ux_mv_top_products_product_id ON mv_top_products (product_id)")
+    op.execute("CREATE INDEX ix_mv_top_products_revenue ON mv_top_products (revenue DESC)")
+
+
+def upgrade() -> None:
+    _recreate(AGGREGATE_THEN_JOIN)
+
+
+def downgrade() -> None:
+    _recreate(JOIN_THEN_AGGREGATE)
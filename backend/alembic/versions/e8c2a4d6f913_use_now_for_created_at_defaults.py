@@ -0,0 +1,34 @@
+"""use now() for the created_at/uploaded_at server defaults
+
+Revision ID: e8c2a4d6f913
+Revises: d2a9c4f7e815
+Create Date: 2026-10-14 16:34:12.775120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c2a4d6f913'
+down_revision: Union[str, None] = 'd2a9c4f7e815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 98686f11de1d, 6cf002aa65b7 and f67bef8cc643 set these defaults to the string
+# 'now()', which Postgres casts once, at ALTER time: every later row got the
+# migration's timestamp. Raw-sales COPY relies on the uploaded_at default, so
+# restore the now() function call.
+COLUMNS = (("products", "created_at"), ("raw_sales", "uploaded_at"))
+
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("now()"))
+
+
+def downgrade() -> None:
+    # The frozen constant is not worth restoring; keep now()
+    pass
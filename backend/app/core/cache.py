@@ -0,0 +1,57 @@
+# backend app response cache
+import logging
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+# Redis when REDIS_URL is set (shared across workers), per-process memory otherwise (dev)
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_PREFIX = "pricing"
+
+DASHBOARD_NAMESPACE = "dash"
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "30"))  # seconds
+
+
+def init_cache() -> None:
+    """Configure the FastAPICache backend. Safe to call once per process."""
+    if REDIS_URL:
+        from redis import asyncio as aioredis
+        from fastapi_cache.backends.redis import RedisBackend
+
+        FastAPICache.init(RedisBackend(aioredis.from_url(REDIS_URL)), prefix=CACHE_PREFIX)
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX)
+
+
+def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Key on path + query params only.
+    The default builder hashes every argument, including the injected DB session,
+    which would make each request a miss.
+    """
+    params = sorted(request.query_params.items()) if request else []
+    path = request.url.path if request else f"{func.__module__}:{func.__name__}"
+    return f"{namespace}:{path}:{params}"
+
+
+async def invalidate_dashboard_cache() -> None:
+    """Drop cached dashboard responses after new sales data lands."""
+    try:
+        await FastAPICache.clear(namespace=DASHBOARD_NAMESPACE)
+    except Exception as e:
+        # A stale dashboard for one TTL is preferable to failing the write path
+        logger.warning(f"Dashboard cache invalidation failed: {e}")
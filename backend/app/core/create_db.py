@@ -1,9 +1,13 @@
+"""
+Dev-only helper: create all tables directly from the models.
+Run with `python -m app.core.create_db`; production schema is managed by Alembic.
+"""
 from app.core.db import Base, engine
 from app.models.product import Product  
 from app.models.sales import RawSales, SalesDaily, Cost   
 from app.models.org import Organization  
 from app.models.ml import ModelRun, Forecast, ElasticityEstimate, PriceRecommendation  
 
-# Create tables in the database 
-Base.metadata.create_all(bind=engine)
-
+if __name__ == "__main__":
+    # Create tables in the database 
+    Base.metadata.create_all(bind=engine)
@@ -1,8 +1,10 @@
 # backend app database 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.engine import URL, make_url
 import os 
+from uuid import uuid4
 from dotenv import load_dotenv
 
 load_dotenv() # Load environment variables 
@@ -18,37 +20,82 @@ DB_NAME = os.getenv("DB_NAME")
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 
-DATABASE_URL =URL.create(
-    drivername="postgresql+psycopg2",
-    username=DB_USERNAME,
-    password=DB_PASSWORD,
-    host=DB_HOST,
-    port=DB_PORT,
-    database=DB_NAME
-)   # only the password field
+# Prefer the explicit DB_* parts (keeps special characters in the password intact),
+# fall back to a full URL from the environment
+if DB_HOST:
+    _base_url = URL.create(
+        drivername="postgresql",
+        username=DB_USERNAME,
+        password=DB_PASSWORD,
+        host=DB_HOST,
+        port=DB_PORT,
+        database=DB_NAME
+    )
+elif DATABASE_URL_1:
+    _base_url = make_url(DATABASE_URL_1)
+else:
+    raise ValueError("DATABASE_PUBLIC_URL or DATABASE_URL environment variable is required")
 
+# Driver selection lives here only: the sync URL serves the request-path engine and
+# Alembic, the async URL serves the ETL and ML services (asyncpg).
+# .set() replaces whatever driver the env URL carried (postgres://, +asyncpg, ...)
+SYNC_URL = _base_url.set(drivername="postgresql+psycopg2")
+ASYNC_URL = _base_url.set(drivername="postgresql+asyncpg")
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_PUBLIC_URL or DATABASE_URL environment variable is required")
+DATABASE_URL = SYNC_URL  # kept for existing imports
+
+# Connection pool settings, shared by every engine built from DATABASE_URL.
+# Size the pool so that (workers x pool_size + max_overflow) stays below the
+# server's max_connections, with some headroom for migrations and psql.
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),  # below Railway's idle timeout
+    "pool_pre_ping": True,  # drop dead connections before handing them out
+}
+
+# Compiled statement cache per engine: room for every statement in the app
+# (default 500) so hot queries never get evicted
+QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
 
-# For Railway deployment, use the internal URL
-# For local development, use the external URL
-# Railway provides both internal and external URLs
-# Use external URL for local development to avoid connection issues
-"""if "railway.internal" in DATABASE_URL:
-    # Replace internal hostname with external hostname for local development
-    DATABASE_URL = DATABASE_URL.replace("railway.internal", "railway.app")
-"""
 # Create engine with DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(SYNC_URL, query_cache_size=QUERY_CACHE_SIZE, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Behind PgBouncer in transaction pooling mode (DB_PGBOUNCER=1) server-side prepared
+# statements cannot be reused across transactions: disable both asyncpg's and
+# SQLAlchemy's statement caches and give each prepared statement a unique name.
+# PgBouncer is then the real pool, so the local pool can stay small (DB_POOL_SIZE=5).
+PGBOUNCER = os.getenv("DB_PGBOUNCER") == "1"
+ASYNC_CONNECT_ARGS = {
+    "statement_cache_size": 0,
+    "prepared_statement_cache_size": 0,
+    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+} if PGBOUNCER else {}
+
+def make_async_engine(pool_size: int | None = None):
+    """
+    Async engine with the app's pool, statement cache and PgBouncer settings.
+    pool_size overrides DB_POOL_SIZE, for jobs that size the pool to their concurrency.
+    """
+    options = POOL_OPTIONS if pool_size is None else {**POOL_OPTIONS, "pool_size": pool_size}
+    return create_async_engine(
+        ASYNC_URL, connect_args=ASYNC_CONNECT_ARGS, query_cache_size=QUERY_CACHE_SIZE, **options
+    )
+
+# Async engine shared by all async routes and services (one pool per process)
+async_engine = make_async_engine()
+async_session_maker = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
 Base = declarative_base()
 
-# Create all tables (automatically)
+# Create all tables (dev only)
 def init_db() -> None:
     """
     Initializes the database by creating all tables.
+    Dev-only shortcut (MIGRATION_MODE=create_all); production schema is managed by Alembic.
+    Run `alembic stamp f1df74e93c99` on a database built this way before `alembic upgrade head`.
     """
     Base.metadata.create_all(bind=engine)
 
@@ -59,4 +106,29 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with async_session_maker() as session:
+        yield session
+
+
+# Above this many rows a COPY beats a batched INSERT
+COPY_MIN_ROWS = int(os.getenv("DB_COPY_MIN_ROWS", "50"))
+
+async def insert_records(session: AsyncSession, table, columns, records) -> None:
+    """
+    Bulk insert plain tuples (no ORM objects) inside the session's transaction.
+    Large batches go through asyncpg's COPY on the session's own connection, small
+    ones through a single executemany INSERT; ids and created_at come from the
+    table defaults either way.
+    """
+    if len(records) > COPY_MIN_ROWS:
+        conn = await session.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=list(columns)
+        )
+    elif records:
+        await session.execute(insert(table), [dict(zip(columns, record)) for record in records])
\ No newline at end of file
@@ -1,186 +1,400 @@
 # backend/app/etl/etl.py
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, func, bindparam, text, table, column, literal_column, any_, BigInteger
+from sqlalchemy.dialects.postgresql import insert, ARRAY
 from app.models.sales import RawSales, SalesDaily
 from app.models.product import Product
-from datetime import date, datetime, timezone
+from app.models.org import Organization
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 from decimal import Decimal
-from pydantic import BaseModel, ValidationError, field_validator
-import json
+import numpy as np
+import pandas as pd
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Columns copied into the per-batch staging table, in record order
+SALES_STAGE_COLUMNS = ["product_id", "date", "units_sold", "price", "revenue"]
 
-class SalesRow(BaseModel):
-    """Protective schema for validating and normalizing sales data."""
-    product_id: UUID
-    date: date  # align with SalesDaily.date if it's a DATE column
-    units_sold: int
-    price: Decimal
-    revenue: Optional[Decimal] = None
+# Temp table is created per transaction and dropped on commit. Columns are listed
+# explicitly (not LIKE sales_daily) so the id sequence default is not copied over.
+CREATE_SALES_STAGE = text(
+    "CREATE TEMP TABLE _sd_stage ("
+    "product_id uuid NOT NULL, "
+    "date date NOT NULL, "
+    "units_sold integer NOT NULL, "
+    "price numeric NOT NULL, "
+    "revenue numeric NOT NULL"
+    ") ON COMMIT DROP"
+)
 
-    @field_validator("units_sold")
-    def non_negative_units(cls, v):
-        if v < 0:
-            raise ValueError("units_sold cannot be negative")
-        return v
+sales_stage = table("_sd_stage", *(column(name) for name in SALES_STAGE_COLUMNS))
 
-    @field_validator("price")
-    def non_negative_price(cls, v):
-        if v < 0:
-            raise ValueError("price cannot be negative")
-        return v
+# Statements reused by every batch. They are built once and only take bound
+# parameters, so SQLAlchemy's compiled cache and asyncpg's prepared statement
+# cache are hit on each execution.
+raw_sales = RawSales.__table__
 
-    def calculate_revenue(self):
-        if self.revenue is None:
-            self.revenue = self.units_sold * self.price
 
+def _status_is(status: str):
+    # Status is inlined as a SQL literal, not bound, so the planner can match the
+    # partial indexes (status = 'pending' etc.) even on a cached generic plan
+    return raw_sales.c.status == literal_column(f"'{status}'")
 
-async def ensure_product_exists(session: AsyncSession, product_id: UUID) -> bool:
-    """Ensure product exists, create minimal record if missing."""
-    result = await session.execute(
-        select(Product).where(Product.id == product_id)
+
+# Per-status row counts as scalar subqueries; each one is an index-only scan of
+# its partial index instead of a FILTER over a full scan of raw_sales
+RAW_STATUS_COUNTS = {
+    status: select(func.count()).select_from(raw_sales).where(_status_is(status)).scalar_subquery().label(status)
+    for status in ("pending", "processed", "failed")
+}
+
+# Claim a batch by row-locking it: SKIP LOCKED keeps concurrent workers off each
+# other's rows, and the locks last until the batch commits with its final status.
+# If a worker dies, its transaction rolls back and the rows are simply pending again.
+CLAIM_PENDING = (
+    select(raw_sales.c.raw_id, raw_sales.c.raw_json)
+    .where(_status_is("pending"))
+    .limit(bindparam("batch_size"))
+    .with_for_update(skip_locked=True)
+)
+
+MARK_PROCESSED = (
+    raw_sales.update()
+    # = ANY(array) keeps the SQL text fixed whatever the batch size (IN would not)
+    .where(raw_sales.c.raw_id == any_(bindparam("processed_ids", type_=ARRAY(BigInteger))))
+    .values(status="processed", error_message=None)
+)
+
+# One UPDATE for all failed rows of a batch, joined against the (raw_id, error)
+# pairs passed as two arrays
+MARK_FAILED = text(
+    "UPDATE raw_sales SET status = 'failed', error_message = v.error_message "
+    "FROM unnest(CAST(:raw_ids AS bigint[]), CAST(:errors AS text[])) "
+    "AS v(raw_id, error_message) "
+    "WHERE raw_sales.raw_id = v.raw_id"
+)
+
+
+# The load is idempotent and re-runnable from raw_sales, so a batch commit does not
+# need to wait for the WAL flush. SET LOCAL scopes this to the current transaction.
+ASYNC_COMMIT = text("SET LOCAL synchronous_commit TO OFF")
+
+
+def _build_merge_sales_stage():
+    stmt = insert(SalesDaily.__table__).from_select(
+        SALES_STAGE_COLUMNS,
+        select(*(sales_stage.c[name] for name in SALES_STAGE_COLUMNS)),
     )
-    if result.scalar_one_or_none():
-        return True
-    
-    # Create minimal product if missing (following Instructions.md 2.4)
+    # created_at is left to its server default on insert and kept on update:
+    # it records when the (product_id, date) row was first loaded
+    return stmt.on_conflict_do_update(
+        index_elements=[SalesDaily.product_id, SalesDaily.date],
+        set_={
+            "units_sold": stmt.excluded.units_sold,
+            "price": stmt.excluded.price,
+            "revenue": stmt.excluded.revenue,
+        }
+    )
+
+
+MERGE_SALES_STAGE = _build_merge_sales_stage()
+
+FIRST_ORG_ID = select(Organization.id).limit(1)
+
+# Serializes creation of the default organization across ETL workers; the lock is
+# transaction-scoped, so it is released when the batch commits or rolls back
+LOCK_DEFAULT_ORG = text("SELECT pg_advisory_xact_lock(hashtext('default_organization'))")
+
+
+def _pick(payloads: list[dict], names: tuple[str, ...], default) -> pd.Series:
+    """
+    Value of the first alias key present in each payload, even when it is null
+    (an explicit null is an error, not a default); `default` if none is present.
+    """
+    values = []
+    for data in payloads:
+        for name in names:
+            if name in data:
+                values.append(data[name])
+                break
+        else:
+            values.append(default)
+    return pd.Series(values, dtype=object)
+
+
+def _parse_uuid(value) -> Optional[UUID]:
     try:
-        # First, try to find any existing organization, or create a default one
-        from app.models.org import Organization
-        
-        org_result = await session.execute(select(Organization).limit(1))
-        org = org_result.scalar_one_or_none()
-        
-        if not org:
-            # Create a default organization for auto-created products
-            org = Organization(name="Default Organization")
-            session.add(org)
-            await session.flush()
-            logger.info(f"Created default organization {org.id}")
-        
-        product = Product(
-            id=product_id,  # Use the provided UUID
-            org_id=org.id,  # Use the found/created org
-            sku=f"AUTO-{product_id.hex[:8]}",
-            name=f"Auto-created Product {product_id.hex[:8]}",
-            currency="USD"  # Default currency
-        )
-        session.add(product)
-        await session.flush()  # Get the ID assigned
-        logger.warning(f"Created missing product {product_id} for org {org.id}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to create product {product_id}: {e}")
-        return False
+        return value if isinstance(value, UUID) else UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_number(value) -> float:
+    """
+    Float value of a JSON number or numeric string, NaN for anything else.
+    JSON true/false would otherwise coerce to 1/0, and ints beyond float range
+    raise OverflowError, which would fail the whole batch instead of the row.
+    """
+    if isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return np.nan
+
+
+def transform_batch(raw_rows) -> tuple[list[tuple], list[int], list[tuple[int, str]]]:
+    """
+    Validate and normalize a batch of raw rows in one vectorized pandas pass.
+
+    Aliases: productID → product_id, quantity → units_sold, unit_price → price.
+    Missing values default as before: date to today (UTC), units_sold and price
+    to 0, revenue to units_sold * price; an explicit null units_sold or price fails
+    the row. Rules: product_id is a UUID, date is ISO (YYYY-MM-DD), units_sold is a
+    non-negative integer that fits the int4 column, price is a finite non-negative
+    number, revenue (when given) is a finite number. Booleans are not numbers.
+
+    Returns:
+        Tuple of (sales records ordered as SALES_STAGE_COLUMNS and deduplicated
+        by (product_id, date), processed raw_ids, failed (raw_id, error) pairs).
+        Record values are plain UUID/date/int/Decimal, ready for binary COPY.
+    """
+    failed: list[tuple[int, str]] = []
+    raw_ids: list[int] = []
+    payloads: list[dict] = []
+
+    for raw in raw_rows:
+        data = raw.raw_json
+        try:
+            if isinstance(data, (str, bytes)):
+                data = orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            failed.append((raw.raw_id, f"raw_json is not valid JSON: {e}"))
+            continue
+        if not isinstance(data, dict):
+            failed.append((raw.raw_id, "raw_json must be an object"))
+            continue
+        raw_ids.append(raw.raw_id)
+        payloads.append(data)
+
+    if not payloads:
+        return [], [], failed
+
+    # Columns are built per key rather than through a DataFrame: pandas cannot
+    # hold ints beyond float range, and such a value must fail only its own row
+    product_ids = _pick(payloads, ("product_id", "productID"), None).map(_parse_uuid)
+
+    raw_dates = _pick(payloads, ("date",), None)
+    missing_date = raw_dates.isna() | (raw_dates == "")
+    # The whole value must be YYYY-MM-DD; trailing text or a time part is an error
+    date_text = raw_dates.where(~missing_date).astype("string")
+    parsed_dates = pd.to_datetime(
+        date_text.where(date_text.str.fullmatch(r"\d{4}-\d{2}-\d{2}").fillna(False)),
+        format="%Y-%m-%d",
+        errors="coerce",
+    )
+    dates = parsed_dates.dt.date.where(~missing_date, datetime.now(timezone.utc).date())
+
+    raw_units = _pick(payloads, ("units_sold", "quantity"), 0)
+    raw_prices = _pick(payloads, ("price", "unit_price"), 0)
+    raw_revenue = _pick(payloads, ("revenue",), None)
+    units = raw_units.map(_to_number)
+    prices = raw_prices.map(_to_number)
+    revenue = raw_revenue.map(_to_number)
+
+    # First failing rule per row; empty string means valid
+    errors = pd.Series(np.select(
+        [
+            product_ids.isna().to_numpy(),
+            (~missing_date & parsed_dates.isna()).to_numpy(),
+            raw_units.isna().to_numpy(),
+            (units.isna() | (units % 1 != 0)).to_numpy(),
+            (units < 0).to_numpy(),
+            (units > 2**31 - 1).to_numpy(),
+            raw_prices.isna().to_numpy(),
+            prices.isna().to_numpy(),
+            ~np.isfinite(prices.to_numpy()),
+            (prices < 0).to_numpy(),
+            (raw_revenue.notna() & revenue.isna()).to_numpy(),
+            (revenue.notna() & ~np.isfinite(revenue.to_numpy())).to_numpy(),
+        ],
+        [
+            "product_id must be a valid UUID",
+            "date must be an ISO date (YYYY-MM-DD)",
+            "units_sold cannot be null",
+            "units_sold must be an integer",
+            "units_sold cannot be negative",
+            "units_sold is out of range (max 2147483647)",
+            "price cannot be null",
+            "price must be a number",
+            "price must be finite",
+            "price cannot be negative",
+            "revenue must be a number",
+            "revenue must be finite",
+        ],
+        default="",
+    ))
+    valid = errors == ""
+
+    for raw_id, error in zip(np.asarray(raw_ids)[~valid.to_numpy()].tolist(), errors[~valid]):
+        logger.error(f"Validation failed for raw_id={raw_id}: {error}")
+        failed.append((raw_id, error))
+
+    clean = pd.DataFrame({
+        "product_id": product_ids[valid],
+        "date": dates[valid],
+        "units_sold": units[valid].astype("int64"),
+        # Decimal from the original text keeps exact cents (no float rounding)
+        "price": raw_prices[valid].map(lambda v: Decimal(str(v))),
+        "revenue": raw_revenue[valid].where(revenue[valid].fillna(0) != 0),
+    })
+    computed = clean["units_sold"].map(Decimal) * clean["price"]
+    clean["revenue"] = [
+        Decimal(str(given)) if given is not None and not pd.isna(given) else fallback
+        for given, fallback in zip(clean["revenue"], computed)
+    ]
+
+    # Deduplicate by (product_id, date): a single INSERT ... ON CONFLICT
+    # cannot touch the same row twice, so the last row in the batch wins.
+    clean = clean.drop_duplicates(subset=["product_id", "date"], keep="last")
+
+    records = list(zip(
+        clean["product_id"].tolist(),
+        clean["date"].tolist(),
+        clean["units_sold"].tolist(),
+        clean["price"].tolist(),
+        clean["revenue"].tolist(),
+    ))
+    processed_ids = np.asarray(raw_ids)[valid.to_numpy()].tolist()
+    return records, processed_ids, failed
+
+
+async def get_default_org_id(session: AsyncSession) -> UUID:
+    """
+    Find any existing organization, or create a default one for auto-created products.
+    Looked up on every call (only batches with new products get here), so nothing
+    goes stale across event loops or deleted organizations.
+    """
+    org_id = (await session.execute(FIRST_ORG_ID)).scalar_one_or_none()
+    if org_id is not None:
+        return org_id
+
+    # Concurrent workers can all find none: the first one to take the lock creates
+    # the org, the others wait for its commit and then find it on the second look
+    await session.execute(LOCK_DEFAULT_ORG)
+    org_id = (await session.execute(FIRST_ORG_ID)).scalar_one_or_none()
+    if org_id is not None:
+        return org_id
+
+    org = Organization(name="Default Organization")
+    session.add(org)
+    await session.flush()
+    logger.info(f"Created default organization {org.id}")
+    return org.id
+
+
+async def ensure_products_exist(session: AsyncSession, product_ids: set[UUID]) -> None:
+    """
+    Ensure all products in a batch exist, creating minimal records for missing ones
+    (following Instructions.md 2.4). Uses one SELECT and at most one INSERT per batch.
+    """
+    if not product_ids:
+        return
+
+    result = await session.execute(
+        select(Product.id).where(Product.id.in_(product_ids))
+    )
+    missing = product_ids - set(result.scalars())
+    if not missing:
+        return
+
+    org_id = await get_default_org_id(session)
+    await session.execute(
+        insert(Product.__table__)
+        .values([
+            {
+                "id": product_id,  # Use the provided UUID
+                "org_id": org_id,
+                "sku": f"AUTO-{product_id.hex[:8]}",
+                "name": f"Auto-created Product {product_id.hex[:8]}",
+                "currency": "USD",  # Default currency
+            }
+            for product_id in missing
+        ])
+        .on_conflict_do_nothing(index_elements=[Product.id])
+    )
+    logger.warning(f"Created {len(missing)} missing products for org {org_id}")
+
+
+async def copy_sales_batch(session: AsyncSession, records: list[tuple]) -> None:
+    """
+    Bulk-load sales records via COPY into a temp staging table, then merge them
+    into sales_daily with a single INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+    Records are tuples ordered as SALES_STAGE_COLUMNS.
+    """
+    await session.execute(CREATE_SALES_STAGE)
+
+    # COPY is only exposed by the driver, so go through the raw asyncpg connection
+    # (same connection and transaction as the session). asyncpg sends records in
+    # COPY binary format, so values must already be the native Python types of
+    # the column codecs: UUID, date, int, Decimal (see transform_batch).
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    pg = raw.driver_connection
+    await pg.copy_records_to_table(
+        "_sd_stage", records=records, columns=SALES_STAGE_COLUMNS, schema_name="pg_temp"
+    )
+    await session.execute(MERGE_SALES_STAGE)
 
 
 async def run_etl(session: AsyncSession, batch_size: int = 500):
     """
     Extract-Transform-Load pipeline with improvements:
-    1. Extract pending rows in batches (row-locking to avoid concurrency issues)
-    2. Transform → validate & normalize (Pydantic schema)
-    3. Load → ensure products exist, then upsert sales
-    4. Update RawSales status (processed/failed + error message)
+    1. Claim pending rows in batches (SELECT ... FOR UPDATE SKIP LOCKED)
+    2. Transform → validate & normalize the batch (vectorized pandas pass)
+    3. Load → ensure products exist, then COPY the batch and merge into sales_daily
+    4. Bulk-update RawSales status (processed/failed + error message)
     """
 
     while True:
-        # 1) Extract with SKIP LOCKED to avoid duplicate work if multiple workers
-        result = await session.execute(
-            select(RawSales)
-            .where(RawSales.status == "pending")
-            .limit(batch_size)
-            .with_for_update(skip_locked=True)
-        )
-        raw_rows = result.scalars().all()
+        # First statement of the batch transaction
+        await session.execute(ASYNC_COMMIT)
+
+        # 1) Extract: lock a batch of pending rows and read it in one round-trip.
+        # SKIP LOCKED avoids duplicate work if multiple workers run concurrently.
+        result = await session.execute(CLAIM_PENDING, {"batch_size": batch_size})
+        raw_rows = result.all()
 
         if not raw_rows:
             logger.info("No more raw sales to process.")
             break
 
-        for raw in raw_rows:
-            try:
-                # Handle JSON field
-                data = raw.raw_json
-                if isinstance(data, str):
-                    data = json.loads(data)
-
-                # 2) Transform: explicit defaults (no `or` to avoid overriding 0)
-                normalized = {
-                    "product_id": (
-                        data["product_id"] if "product_id" in data else data.get("productID")
-                    ),
-                    "date": (
-                        datetime.fromisoformat(data["date"]).date()
-                        if "date" in data and data["date"]
-                        else datetime.now(timezone.utc).date()
-                    ),
-                    "units_sold": (
-                        data["units_sold"] if "units_sold" in data else data.get("quantity", 0)
-                    ),
-                    "price": (
-                        Decimal(str(data["price"]))
-                        if "price" in data
-                        else Decimal(str(data.get("unit_price", "0")))
-                    ),
-                    "revenue": (
-                        Decimal(str(data["revenue"])) if "revenue" in data and data["revenue"] else None
-                    ),
-                }
-
-                # Validate with Pydantic (will coerce types + enforce rules)
-                sales_row = SalesRow(**normalized)
-                sales_row.calculate_revenue()
-
-                # 3) Load → ensure product exists, then upsert sales
-                if not await ensure_product_exists(session, sales_row.product_id):
-                    raise Exception(f"Failed to ensure product {sales_row.product_id} exists")
-
-                stmt = insert(SalesDaily.__table__).values(
-                    product_id=sales_row.product_id,
-                    date=sales_row.date,
-                    units_sold=sales_row.units_sold,
-                    price=sales_row.price,
-                    revenue=sales_row.revenue,
-                    created_at=func.now(),
-                ).on_conflict_do_update(
-                    index_elements=[SalesDaily.product_id, SalesDaily.date],
-                    set_={
-                        "units_sold": sales_row.units_sold,
-                        "price": sales_row.price,
-                        "revenue": sales_row.revenue,
-                        "created_at": func.now(),
-                    }
-                )
-                await session.execute(stmt)
-
-                # 4) Mark staging row as processed
-                await session.execute(
-                    update(RawSales)
-                    .where(RawSales.raw_id == raw.raw_id)
-                    .values(status="processed", error_message=None)
-                )
-
-            except ValidationError as e:
-                logger.error(f"Validation failed for raw_id={raw.raw_id}: {e}")
-                await session.execute(
-                    update(RawSales)
-                    .where(RawSales.raw_id == raw.raw_id)
-                    .values(status="failed", error_message=str(e))
-                )
-
-            except Exception as e:
-                logger.exception(f"Unexpected ETL error for raw_id={raw.raw_id}: {e}")
-                await session.execute(
-                    update(RawSales)
-                    .where(RawSales.raw_id == raw.raw_id)
-                    .values(status="failed", error_message=str(e))
-                )
+        # 2) Transform: validate the whole batch at once. Results are written
+        # with one statement each instead of per-row round-trips.
+        sales_records, processed_ids, failed = transform_batch(raw_rows)
+
+        # 3) Load → ensure products exist, then COPY the whole batch into staging
+        # and merge in one statement
+        if sales_records:
+            await ensure_products_exist(
+                session, {record[0] for record in sales_records}
+            )
+            await copy_sales_batch(session, sales_records)
+
+        # 4) Mark staging rows as processed/failed in bulk
+        if processed_ids:
+            await session.execute(MARK_PROCESSED, {"processed_ids": processed_ids})
+
+        if failed:
+            failed_ids, errors = zip(*failed)
+            await session.execute(
+                MARK_FAILED, {"raw_ids": list(failed_ids), "errors": list(errors)}
+            )
 
         # Commit after each batch
         await session.commit()
@@ -0,0 +1,40 @@
+# backend/app/etl/refresh_views.py
+"""
+Refresh the dashboard materialized views.
+CONCURRENTLY keeps the views readable while they rebuild (each has a unique index).
+
+Usage: python -m app.etl.refresh_views  (run from cron, e.g. */5 * * * *)
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+
+from app.core.db import async_engine
+from app.core.cache import init_cache, invalidate_dashboard_cache
+from app.models.views import DASHBOARD_VIEWS
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_dashboard_views() -> None:
+    """Refresh every dashboard view, one transaction per view."""
+    for view in DASHBOARD_VIEWS:
+        async with async_engine.begin() as conn:
+            await conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}"))
+        logger.info(f"Refreshed {view.name}")
+
+
+async def main() -> None:
+    try:
+        await refresh_dashboard_views()
+        await invalidate_dashboard_cache()
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    init_cache()
+    asyncio.run(main())
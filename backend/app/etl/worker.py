@@ -0,0 +1,51 @@
+# backend/app/etl/worker.py
+"""
+ETL worker - drain pending raw_sales with several concurrent consumers.
+Each consumer runs run_etl on its own session; FOR UPDATE SKIP LOCKED in the
+claim query keeps them from picking up the same rows.
+
+Usage: python -m app.etl.worker  (ETL_WORKERS sets the number of consumers)
+"""
+
+import asyncio
+import logging
+import os
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import make_async_engine
+from app.core.cache import init_cache, invalidate_dashboard_cache
+from app.etl.etl import run_etl
+
+logger = logging.getLogger(__name__)
+
+ETL_WORKERS = int(os.getenv("ETL_WORKERS", "4"))
+
+
+async def worker_loop(session_factory, worker_id: int) -> None:
+    """Run the ETL until the queue is empty, on a dedicated session."""
+    async with session_factory() as session:
+        await run_etl(session)
+    logger.info(f"ETL worker {worker_id} finished")
+
+
+async def run_workers(num_workers: int = ETL_WORKERS) -> None:
+    """Run num_workers ETL consumers concurrently and wait for all of them."""
+    # One pooled connection per consumer, plus a little headroom
+    engine = make_async_engine(pool_size=num_workers + 2)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        await asyncio.gather(
+            *(worker_loop(session_factory, worker_id) for worker_id in range(num_workers))
+        )
+        # Only reaches the API's cache when both share Redis (REDIS_URL)
+        await invalidate_dashboard_cache()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    init_cache()
+    asyncio.run(run_workers())
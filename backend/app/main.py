@@ -2,20 +2,27 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
-from app.core.db import init_db
+from app.core.db import init_db, async_engine
+from app.core.cache import init_cache
 import app.models  # ensure models are registered
 from app.routers.health import router as health_router
 from app.routers.products import router as products_router
 from app.routers.sales import router as sales_router
 from app.routers.ml import router as ml_router
+from app.routers.dashboard import router as dashboard_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    init_db()
+    # Schema is owned by Alembic (`alembic upgrade head`); create_all is opt-in for local dev.
+    # A create_all database must be stamped (`alembic stamp f1df74e93c99`) before its first upgrade
+    if os.getenv("MIGRATION_MODE") == "create_all":
+        init_db()
+    init_cache()
     yield
     # Shutdown
+    await async_engine.dispose()
 
 app = FastAPI(title="Dynamic Pricing & Forecasting API", version="1.0.0", lifespan=lifespan)
 
@@ -33,4 +40,5 @@ app.include_router(health_router, prefix="")
 app.include_router(products_router, prefix="")
 app.include_router(sales_router, prefix="")
 app.include_router(ml_router, prefix="")
+app.include_router(dashboard_router, prefix="")
 
@@ -18,7 +18,7 @@ class ModelRun(Base):
         - finished_at: End timestamp (nullable)
     """
     __tablename__ = "model_runs"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     model_name = Column(String, nullable=False)
     model_version = Column(String, nullable=False)
     params = Column(JSON, nullable=True)
@@ -6,6 +6,6 @@ from datetime import datetime
 
 class Organization(Base):
     __tablename__ = "organizations"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     name = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
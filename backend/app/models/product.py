@@ -18,7 +18,7 @@ class Product(Base):
         - created_at: Timestamp of creation
     """
     __tablename__ = "products"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
     sku = Column(String, nullable=False)
     name = Column(String, nullable=False)
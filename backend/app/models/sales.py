@@ -13,7 +13,7 @@ class RawSales(Base):
         - uploaded_at: Timestamp of upload
         - source: Source identifier (client, file, etc.)
         - raw_json: Original row as JSON
-        - status: ETL status (pending, processed, error)
+        - status: ETL status (pending, processed, failed)
         - error_message: Optional error text when processing fails
     """
     __tablename__ = "raw_sales"
@@ -38,7 +38,11 @@ class SalesDaily(Base):
     """
     __tablename__ = "sales_daily"
     __table_args__ = (
-        UniqueConstraint("product_id", "date", name="uq_sales_product_date"),
+        # Covering: per-product date-range reads (elasticity, forecasting) are index-only
+        UniqueConstraint(
+            "product_id", "date", name="uq_sales_product_date",
+            postgresql_include=["price", "units_sold", "revenue"],
+        ),
     )
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"), nullable=False)
@@ -0,0 +1,162 @@
+"""
+Dashboard Router - Read-only aggregates for the frontend overview page.
+Following Instructions.md FR8: overview charts (sales trend, top products) and ETL status banner.
+
+New API surface (documented in Instructions.md 6.6): GET /dashboard/stats,
+/dashboard/sales-trend, /dashboard/top-products and /dashboard/raw-sales, with
+their response models in app/schemas/dashboard.py. It was added along with the
+dashboard stats round-trip work, as the tree had no dashboard router to optimize.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from fastapi_cache.decorator import cache
+from sqlalchemy import select, func, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.db import get_async_db
+from app.core.cache import DASHBOARD_NAMESPACE, DASHBOARD_CACHE_TTL, request_key_builder
+from app.models.sales import RawSales
+from app.models.product import Product
+from app.models.org import Organization
+from app.models.views import mv_sales_daily_totals, mv_sales_by_date, mv_top_products
+from app.schemas.product import RawSalesOut
+from app.schemas.dashboard import (
+    DashboardStats, EtlStatusCounts, SalesTrend, SalesTrendPoint, TopProduct, TopProducts
+)
+from app.etl.etl import RAW_STATUS_COUNTS
+from datetime import date, timedelta
+from typing import List, Optional
+
+router = APIRouter()
+
+# Statements are built once at import; with bound parameters the SQL text is fixed,
+# so SQLAlchemy compiles each one once and serves later requests from its cache
+totals = mv_sales_daily_totals.c
+by_date = mv_sales_by_date.c
+top = mv_top_products.c
+
+# Sales totals are read from the pre-aggregated view; entity and ETL status counts
+# are scalar subqueries (the latter served by partial indexes), so the whole
+# stats payload is one SELECT
+DASHBOARD_STATS = (
+    select(
+        select(totals.total_units_sold).scalar_subquery().label("total_units_sold"),
+        select(totals.total_revenue).scalar_subquery().label("total_revenue"),
+        select(totals.refreshed_at).scalar_subquery().label("refreshed_at"),
+        select(func.count(Product.id)).scalar_subquery().label("total_products"),
+        select(func.count(Organization.id)).scalar_subquery().label("total_organizations"),
+        *RAW_STATUS_COUNTS.values(),
+    )
+)
+
+SALES_TREND = (
+    select(by_date.date, by_date.units_sold, by_date.revenue, by_date.refreshed_at)
+    .where(by_date.date >= bindparam("start_date"), by_date.date <= bindparam("end_date"))
+    .order_by(by_date.date)
+)
+
+TOP_PRODUCTS = (
+    select(top.product_id, top.name, top.units_sold, top.revenue, top.avg_price, top.refreshed_at)
+    .order_by(top.revenue.desc())
+    .limit(bindparam("limit"))
+)
+
+RECENT_RAW_SALES = select(
+    RawSales.raw_id,
+    RawSales.uploaded_at,
+    RawSales.source,
+    RawSales.status,
+    RawSales.error_message,
+    RawSales.raw_json,
+).order_by(RawSales.uploaded_at.desc()).limit(bindparam("limit"))
+RECENT_RAW_SALES_BY_STATUS = RECENT_RAW_SALES.where(RawSales.status == bindparam("status"))
+
+
+@router.get("/dashboard/stats", response_model=DashboardStats)
+@cache(expire=DASHBOARD_CACHE_TTL, namespace=DASHBOARD_NAMESPACE, key_builder=request_key_builder)
+async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)) -> DashboardStats:
+    """Headline totals and ETL progress, computed in a single round-trip."""
+    result = await db.execute(DASHBOARD_STATS)
+    stats = result.one()
+
+    return DashboardStats(
+        total_units_sold=stats.total_units_sold,
+        total_revenue=stats.total_revenue,
+        total_products=stats.total_products,
+        total_organizations=stats.total_organizations,
+        refreshed_at=stats.refreshed_at,
+        etl_status=EtlStatusCounts(
+            pending=stats.pending,
+            processed=stats.processed,
+            failed=stats.failed,
+        ),
+    )
+
+
+@router.get("/dashboard/sales-trend", response_model=SalesTrend)
+@cache(expire=DASHBOARD_CACHE_TTL, namespace=DASHBOARD_NAMESPACE, key_builder=request_key_builder)
+async def get_sales_trend(
+    days: int = Query(30, ge=1, le=730, description="Number of days to look back"),
+    db: AsyncSession = Depends(get_async_db)
+) -> SalesTrend:
+    """Daily units sold and revenue over the last `days` days."""
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days)
+
+    result = await db.execute(SALES_TREND, {"start_date": start_date, "end_date": end_date})
+    rows = result.all()
+
+    return SalesTrend(
+        days=days,
+        refreshed_at=rows[0].refreshed_at if rows else None,
+        trend=[SalesTrendPoint.model_validate(row) for row in rows],
+    )
+
+
+@router.get("/dashboard/top-products", response_model=TopProducts)
+@cache(expire=DASHBOARD_CACHE_TTL, namespace=DASHBOARD_NAMESPACE, key_builder=request_key_builder)
+async def get_top_products(
+    limit: int = Query(10, ge=1, le=100, description="Number of products to return"),
+    db: AsyncSession = Depends(get_async_db)
+) -> TopProducts:
+    """Products ranked by total revenue."""
+    result = await db.execute(TOP_PRODUCTS, {"limit": limit})
+    rows = result.all()
+
+    return TopProducts(
+        refreshed_at=rows[0].refreshed_at if rows else None,
+        products=[TopProduct.model_validate(row) for row in rows],
+    )
+
+
+async def _stream_json_array(result):
+    """
+    Encode streamed rows as one JSON array, a row at a time. FastAPI does not apply
+    response_model to a StreamingResponse, so each row is checked against
+    RawSalesOut here and serialized by the model.
+    """
+    yield b"["
+    separator = b""
+    async for row in result:
+        yield separator + RawSalesOut.model_validate(row).model_dump_json().encode()
+        separator = b","
+    yield b"]"
+
+
+# Streamed rather than cached: the listing is for inspecting fresh ETL failures, and
+# raw_json payloads make a materialized response (and a cache entry) large
+@router.get("/dashboard/raw-sales", response_model=List[RawSalesOut])
+async def get_raw_sales(
+    limit: int = Query(50, ge=1, le=500, description="Number of rows to return"),
+    status: Optional[str] = Query(None, description="Filter by ETL status"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Most recent raw uploads, for inspecting ETL failures."""
+    # Server-side cursor; rows are fetched yield_per at a time while the body is sent
+    if status:
+        stmt, params = RECENT_RAW_SALES_BY_STATUS, {"limit": limit, "status": status}
+    else:
+        stmt, params = RECENT_RAW_SALES, {"limit": limit}
+    result = await db.stream(stmt.execution_options(yield_per=100), params)
+
+    return StreamingResponse(_stream_json_array(result), media_type="application/json")
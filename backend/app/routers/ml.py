@@ -3,10 +3,9 @@ ML Router - Endpoints for machine learning operations.
 Following Instructions.md 2.5: ML endpoints for elasticity, forecasting, and pricing.
 """
 
-from fastapi import APIRouter, Query, HTTPException
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from app.core.db import DATABASE_URL
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.db import get_async_db
 import logging
 from typing import Optional
 from datetime import date
@@ -16,28 +15,13 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def get_async_session():
-    """Create async session for ML operations."""
-    try:
-        # Convert sync URL to async URL
-        
-        async_url = DATABASE_URL.set(drivername="postgresql+asyncpg")
-        
-        logger.info(f"Creating async engine with URL: {async_url}")
-        engine = create_async_engine(async_url, future=True, echo=False)
-        AsyncLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
-        return AsyncLocal, engine
-    except Exception as e:
-        logger.error(f"Failed to create async session: {e}")
-        raise
-
-
 @router.post("/ml/estimate-elasticity")
 async def estimate_elasticity_endpoint(
     product_id: str = Query(..., description="Product UUID"),
     window_days: int = Query(90, description="Days to look back for elasticity calculation"),
     min_price_variance: float = Query(0.1, description="Minimum price coefficient of variation"),
-    min_r2_threshold: float = Query(0.2, description="Minimum R² threshold")
+    min_r2_threshold: float = Query(0.2, description="Minimum R² threshold"),
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Estimate price elasticity for a product using log-log OLS regression."""
     try:
@@ -46,26 +30,21 @@ async def estimate_elasticity_endpoint(
         logger.error(f"Failed to import elasticity service: {e}")
         raise HTTPException(status_code=500, detail="Elasticity service not available")
     
-    session_factory, engine = get_async_session()
-    
     try:
-        async with session_factory() as async_session:
-            result = await estimate_elasticity(
-                session=async_session,
-                product_id=product_id,
-                window_days=window_days,
-                min_price_variance=min_price_variance,
-                min_r2_threshold=min_r2_threshold
-            )
-            return result
+        result = await estimate_elasticity(
+            session=session,
+            product_id=product_id,
+            window_days=window_days,
+            min_price_variance=min_price_variance,
+            min_r2_threshold=min_r2_threshold
+        )
+        return result
     except ValueError as e:
         logger.warning(f"Validation error in elasticity estimation: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Unexpected error in elasticity estimation: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Elasticity estimation failed: {str(e)}")
-    finally:
-        await engine.dispose()
 
 
 @router.post("/ml/run-forecast")
@@ -73,7 +52,8 @@ async def run_forecast_endpoint(
     product_id: str = Query(..., description="Product UUID"),
     horizon: int = Query(30, description="Number of days to forecast"),
     min_data_days: int = Query(60, description="Minimum days of data required"),
-    test_days: int = Query(14, description="Days to use for testing/evaluation")
+    test_days: int = Query(14, description="Days to use for testing/evaluation"),
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Run demand forecasting for a product using LightGBM."""
     try:
@@ -82,18 +62,15 @@ async def run_forecast_endpoint(
         logger.error(f"Failed to import forecasting service: {e}")
         raise HTTPException(status_code=500, detail="Forecasting service not available")
     
-    session_factory, engine = get_async_session()
-    
     try:
-        async with session_factory() as async_session:
-            result = await run_forecast(
-                session=async_session,
-                product_id=product_id,
-                horizon=horizon,
-                min_data_days=min_data_days,
-                test_days=test_days
-            )
-            return result
+        result = await run_forecast(
+            session=session,
+            product_id=product_id,
+            horizon=horizon,
+            min_data_days=min_data_days,
+            test_days=test_days
+        )
+        return result
     except ValueError as e:
         logger.warning(f"Validation error in forecasting: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -103,8 +80,6 @@ async def run_forecast_endpoint(
     except Exception as e:
         logger.error(f"Unexpected error in forecasting: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Forecasting failed: {str(e)}")
-    finally:
-        await engine.dispose()
 
 
 @router.post("/ml/recommend-prices")
@@ -113,7 +88,8 @@ async def recommend_prices_endpoint(
     objective: str = Query("revenue", description="Optimization objective: 'revenue' or 'profit'"),
     pmin: Optional[float] = Query(None, description="Minimum price (defaults to 0.5 * baseline)"),
     pmax: Optional[float] = Query(None, description="Maximum price (defaults to 1.5 * baseline)"),
-    horizon: int = Query(30, description="Number of days to recommend prices for")
+    horizon: int = Query(30, description="Number of days to recommend prices for"),
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Recommend optimal prices for a product using elasticity and demand curves."""
     try:
@@ -122,34 +98,30 @@ async def recommend_prices_endpoint(
         logger.error(f"Failed to import pricing service: {e}")
         raise HTTPException(status_code=500, detail="Pricing service not available")
     
-    session_factory, engine = get_async_session()
-    
     try:
-        async with session_factory() as async_session:
-            result = await recommend_prices(
-                session=async_session,
-                product_id=product_id,
-                objective=objective,
-                pmin=pmin,
-                pmax=pmax,
-                horizon=horizon
-            )
-            return result
+        result = await recommend_prices(
+            session=session,
+            product_id=product_id,
+            objective=objective,
+            pmin=pmin,
+            pmax=pmax,
+            horizon=horizon
+        )
+        return result
     except ValueError as e:
         logger.warning(f"Validation error in price recommendation: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Unexpected error in price recommendation: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Price recommendation failed: {str(e)}")
-    finally:
-        await engine.dispose()
 
 
 @router.get("/products/{product_id}/forecasts")
 async def get_product_forecasts(
     product_id: str,
     from_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
-    to_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)")
+    to_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Get forecasts for a specific product within a date range."""
     try:
@@ -158,22 +130,17 @@ async def get_product_forecasts(
         logger.error(f"Failed to import forecasting service: {e}")
         raise HTTPException(status_code=500, detail="Forecasting service not available")
     
-    session_factory, engine = get_async_session()
-    
     try:
-        async with session_factory() as async_session:
-            forecasts = await get_forecasts(
-                session=async_session,
-                product_id=product_id,
-                from_date=from_date,
-                to_date=to_date
-            )
-            return {"forecasts": forecasts}
+        forecasts = await get_forecasts(
+            session=session,
+            product_id=product_id,
+            from_date=from_date,
+            to_date=to_date
+        )
+        return {"forecasts": forecasts}
     except Exception as e:
         logger.error(f"Failed to retrieve forecasts: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to retrieve forecasts: {str(e)}")
-    finally:
-        await engine.dispose()
 
 
 @router.get("/products/{product_id}/recommendations")
@@ -181,7 +148,8 @@ async def get_product_recommendations(
     product_id: str,
     from_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
     to_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
-    objective: Optional[str] = Query(None, description="Filter by objective: 'revenue' or 'profit'")
+    objective: Optional[str] = Query(None, description="Filter by objective: 'revenue' or 'profit'"),
+    session: AsyncSession = Depends(get_async_db)
 ):
     """Get price recommendations for a specific product within a date range."""
     try:
@@ -190,20 +158,15 @@ async def get_product_recommendations(
         logger.error(f"Failed to import pricing service: {e}")
         raise HTTPException(status_code=500, detail="Pricing service not available")
     
-    session_factory, engine = get_async_session()
-    
     try:
-        async with session_factory() as async_session:
-            recommendations = await get_price_recommendations(
-                session=async_session,
-                product_id=product_id,
-                from_date=from_date,
-                to_date=to_date,
-                objective=objective
-            )
-            return {"recommendations": recommendations}
+        recommendations = await get_price_recommendations(
+            session=session,
+            product_id=product_id,
+            from_date=from_date,
+            to_date=to_date,
+            objective=objective
+        )
+        return {"recommendations": recommendations}
     except Exception as e:
         logger.error(f"Failed to retrieve recommendations: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to retrieve recommendations: {str(e)}")
-    finally:
-        await engine.dispose()
@@ -1,25 +1,27 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from app.core.db import get_async_db
 from app.models.org import Organization
 from app.models.product import Product
 
 router = APIRouter()
 
+# Ids default client-side (uuid4) and expire_on_commit is off, so the objects are
+# complete after commit without a refresh round-trip
+
 @router.post("/orgs")
-def create_org(name: str, db: Session = Depends(get_db)):
+async def create_org(name: str, db: AsyncSession = Depends(get_async_db)):
     org = Organization(name=name)
     db.add(org)
-    db.commit()
-    db.refresh(org)
+    await db.commit()
     return {"id": str(org.id), "name": org.name}
 
 @router.post("/products")
-def create_product(org_id: str, sku: str, name: str, currency: str, db: Session = Depends(get_db)):
+async def create_product(org_id: UUID, sku: str, name: str, currency: str, db: AsyncSession = Depends(get_async_db)):
     product = Product(org_id=org_id, sku=sku, name=name, currency=currency)
     db.add(product)
-    db.commit()
-    db.refresh(product)
+    await db.commit()
     return {
         "id": str(product.id),
         "org_id": str(product.org_id),
@@ -0,0 +1,60 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime, date
+
+class EtlStatusCounts(BaseModel):
+    """
+    Schema for raw_sales row counts per ETL status.
+    """
+    pending: int
+    processed: int
+    failed: int
+
+class DashboardStats(BaseModel):
+    """
+    Schema for the dashboard headline totals.
+    """
+    total_units_sold: int
+    total_revenue: float
+    total_products: int
+    total_organizations: int
+    refreshed_at: Optional[datetime]
+    etl_status: EtlStatusCounts
+
+class SalesTrendPoint(BaseModel):
+    """
+    Schema for one day of the sales trend.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    date: date
+    units_sold: int
+    revenue: float
+
+class SalesTrend(BaseModel):
+    """
+    Schema for daily sales over a look-back window.
+    """
+    days: int
+    refreshed_at: Optional[datetime]
+    trend: List[SalesTrendPoint]
+
+class TopProduct(BaseModel):
+    """
+    Schema for a product ranked by revenue.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    product_id: UUID
+    name: str
+    units_sold: int
+    revenue: float
+    avg_price: float
+
+class TopProducts(BaseModel):
+    """
+    Schema for the top products by revenue.
+    """
+    refreshed_at: Optional[datetime]
+    products: List[TopProduct]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from uuid import UUID
 from datetime import datetime, date
@@ -7,6 +7,8 @@ class ForecastSchema(BaseModel):
     """
     Schema for forecasted demand per product.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[int]
     product_id: UUID
     model_run_id: UUID
@@ -18,6 +20,8 @@ class ElasticityEstimateSchema(BaseModel):
     """
     Schema for price elasticity estimates per product.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[int]
     product_id: UUID
     model_run_id: UUID
@@ -31,6 +35,8 @@ class PriceRecommendationSchema(BaseModel):
     """
     Schema for price recommendations per product and date.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[int]
     product_id: UUID
     model_run_id: UUID
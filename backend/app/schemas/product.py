@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Any
 from uuid import UUID
 from datetime import datetime, date
@@ -7,16 +7,33 @@ class RawSalesSchema(BaseModel):
     """
     Schema for staging raw sales data uploads.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     raw_id: Optional[int]
     uploaded_at: Optional[datetime]
     source: Optional[str]
     raw_json: Any
     status: Optional[str]
 
+class RawSalesOut(BaseModel):
+    """
+    Response schema for raw sales rows listed by the dashboard.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    raw_id: int
+    uploaded_at: Optional[datetime]
+    source: Optional[str]
+    status: str
+    error_message: Optional[str]
+    raw_json: Any
+
 class SalesDailySchema(BaseModel):
     """
     Schema for standardized daily sales data after ETL from RawSales.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[int]
     product_id: UUID
     date: date
@@ -29,6 +46,8 @@ class CostSchema(BaseModel):
     """
     Schema for daily unit cost for each product.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[int]
     product_id: UUID
     date: date
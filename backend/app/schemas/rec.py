@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Any
 from uuid import UUID
 from datetime import datetime
@@ -7,6 +7,8 @@ class ProductSchema(BaseModel):
     """
     Schema for product entity.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[UUID]
     org_id: UUID
     sku: str
@@ -18,6 +20,8 @@ class ModelRunSchema(BaseModel):
     """
     Schema for model run metadata.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[UUID]
     model_name: str
     model_version: str
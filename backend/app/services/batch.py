@@ -0,0 +1,115 @@
+"""
+Batch Service - Re-forecast and re-price many products in one run (nightly job).
+Products are independent, so they run concurrently: a semaphore caps how many
+are in flight, and each one gets its own session (sessions are not safe to
+share between concurrent tasks).
+
+Usage: python -m app.services.batch  (FORECAST_CONCURRENCY sets the limit)
+"""
+
+import asyncio
+import logging
+import os
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import make_async_engine
+from app.models.product import Product
+from app.services.forecasting import run_forecast
+from app.services.pricing import recommend_prices
+
+logger = logging.getLogger(__name__)
+
+FORECAST_CONCURRENCY = int(os.getenv("FORECAST_CONCURRENCY", "8"))
+
+
+async def _forecast_product(
+    session_factory,
+    semaphore: asyncio.Semaphore,
+    product_id: str,
+    horizon: int,
+    objective: str,
+    recommend: bool
+) -> str:
+    """Forecast (and price) one product; returns 'recommended', 'forecasted' or 'failed'."""
+    async with semaphore, session_factory() as session:
+        try:
+            await run_forecast(session=session, product_id=product_id, horizon=horizon)
+        except ValueError as e:
+            logger.warning(f"Skipping forecast for product {product_id}: {e}")
+            return "failed"
+        except Exception as e:
+            logger.error(f"Forecast failed for product {product_id}: {e}", exc_info=True)
+            return "failed"
+
+        if not recommend:
+            return "forecasted"
+
+        # Forecasts are committed above, so a pricing failure keeps them
+        try:
+            await recommend_prices(session=session, product_id=product_id, objective=objective, horizon=horizon)
+        except ValueError as e:
+            logger.warning(f"Skipping price recommendation for product {product_id}: {e}")
+            return "forecasted"
+        except Exception as e:
+            logger.error(f"Price recommendation failed for product {product_id}: {e}", exc_info=True)
+            return "forecasted"
+        return "recommended"
+
+
+async def run_forecast_batch(
+    session_factory,
+    product_ids: List[str],
+    concurrency: int = FORECAST_CONCURRENCY,
+    horizon: int = 30,
+    objective: str = "revenue",
+    recommend: bool = True
+) -> dict:
+    """
+    Forecast and (optionally) recommend prices for many products concurrently.
+
+    Args:
+        session_factory: Async session factory; one session is opened per product
+        product_ids: Products to process
+        concurrency: Maximum number of products in flight
+        horizon: Number of days to forecast / price
+        objective: Pricing objective ('revenue' or 'profit')
+        recommend: Also write price recommendations after each forecast
+
+    Returns:
+        dict with counts per outcome
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes = await asyncio.gather(
+        *(
+            _forecast_product(session_factory, semaphore, product_id, horizon, objective, recommend)
+            for product_id in product_ids
+        )
+    )
+    return {
+        "products": len(product_ids),
+        "recommended": outcomes.count("recommended"),
+        "forecasted": outcomes.count("forecasted"),
+        "failed": outcomes.count("failed"),
+    }
+
+
+async def run_all_products(concurrency: int = FORECAST_CONCURRENCY) -> dict:
+    """Run the batch over every product, on an engine sized for the concurrency."""
+    # One pooled connection per product in flight, plus a little headroom
+    engine = make_async_engine(pool_size=concurrency + 2)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_factory() as session:
+            product_ids = [str(product_id) for product_id in (await session.execute(select(Product.id))).scalars()]
+        return await run_forecast_batch(session_factory, product_ids, concurrency=concurrency)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"Batch finished: {asyncio.run(run_all_products())}")
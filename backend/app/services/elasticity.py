@@ -3,10 +3,8 @@ Elasticity Service - Estimate price elasticity using log-log OLS regression.
 Following Instructions.md 5.1: Fit log–log OLS; store elasticity and r2 with new model_runs row.
 """
 
-import numpy as np
-import pandas as pd
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, cast, and_, Float
 from sqlalchemy.dialects.postgresql import insert
 from app.models.sales import SalesDaily
 from app.models.ml import ModelRun, ElasticityEstimate
@@ -44,64 +42,60 @@ async def estimate_elasticity(
     end_date = date.today()
     start_date = end_date - timedelta(days=window_days)
     
-    # Query sales data for the product in the window
+    # Aggregate in Postgres: only a handful of floats come back, no per-row transfer.
+    # The regression runs over rows where both logs are defined; regr_* use a
+    # numerically stable accumulation, unlike inverting X'X
+    ln_price = func.ln(cast(SalesDaily.price, Float))
+    ln_quantity = func.ln(cast(SalesDaily.units_sold, Float))
+    loggable = and_(SalesDaily.price > 0, SalesDaily.units_sold > 0)
+
     result = await session.execute(
-        select(SalesDaily.date, SalesDaily.price, SalesDaily.units_sold)
+        select(
+            func.count().label("n_rows"),
+            func.stddev_samp(cast(SalesDaily.price, Float)).label("price_std"),
+            func.avg(cast(SalesDaily.price, Float)).label("price_mean"),
+            func.regr_count(ln_quantity, ln_price).filter(loggable).label("n_valid"),
+            func.regr_slope(ln_quantity, ln_price).filter(loggable).label("slope"),
+            func.regr_r2(ln_quantity, ln_price).filter(loggable).label("r2"),
+            func.regr_syy(ln_quantity, ln_price).filter(loggable).label("ss_tot"),
+        )
         .where(
             SalesDaily.product_id == product_id,
             SalesDaily.date >= start_date,
             SalesDaily.date <= end_date
         )
-        .order_by(SalesDaily.date)
     )
-    
-    sales_data = result.fetchall()
-    
-    if len(sales_data) < 10:  # Need minimum data points
-        raise ValueError(f"Insufficient data: only {len(sales_data)} sales records found")
-    
-    # Convert to DataFrame for analysis
-    df = pd.DataFrame(sales_data, columns=['date', 'price', 'units_sold'])
-    
+    stats = result.one()
+
+    if stats.n_rows < 10:  # Need minimum data points
+        raise ValueError(f"Insufficient data: only {stats.n_rows} sales records found")
+
     # Calculate price variance
-    df['price']=df['price'].astype(float)
-    price_cv = df['price'].std() / df['price'].mean()
-    
+    price_cv = stats.price_std / stats.price_mean if stats.price_mean else 0.0
+
     if price_cv < min_price_variance:
         logger.warning(f"Low price variance ({price_cv:.3f}) for product {product_id}")
         confidence = "low_price_variance"
     else:
         confidence = "high"
-    
+
     # Fit log-log OLS: ln(q) = a + b*ln(p)
     # where b is the elasticity
-    df['ln_price'] = np.log(df['price'])
-    df['ln_quantity'] = np.log(df['units_sold'])
-    
-    # Remove any infinite/NaN values
-    df = df.replace([np.inf, -np.inf], np.nan).dropna()
-    
-    if len(df) < 5:
+    data_points = stats.n_valid
+
+    if data_points < 5:
         raise ValueError("Insufficient valid data points after cleaning")
-    
-    # Simple OLS regression
-    X = df['ln_price'].values.reshape(-1, 1)
-    y = df['ln_quantity'].values
-    
-    # Add constant term
-    X_with_const = np.column_stack([np.ones(len(X)), X])
-    
+
+    # regr_slope is NULL when ln(price) has no variance
+    if stats.slope is None:
+        raise ValueError("Failed to calculate elasticity: insufficient price variation")
+
     try:
-        # Solve: (X'X)^(-1) * X'y
-        beta = np.linalg.inv(X_with_const.T @ X_with_const) @ X_with_const.T @ y
-        intercept, elasticity = beta
-        
-        # Calculate R²
-        y_pred = X_with_const @ beta
-        ss_res = np.sum((y - y_pred) ** 2)
-        ss_tot = np.sum((y - np.mean(y)) ** 2)
-        r2 = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
-        
+        elasticity = stats.slope
+
+        # Calculate R² (0 when demand is constant, as before)
+        r2 = stats.r2 if stats.ss_tot > 0 else 0
+
         # Check R² threshold
         if r2 < min_r2_threshold:
             confidence = "low_r2"
@@ -120,7 +114,7 @@ async def estimate_elasticity(
                 "window_days": window_days,
                 "start_date": start_date.isoformat(),
                 "end_date": end_date.isoformat(),
-                "data_points": len(df),
+                "data_points": data_points,
                 "price_cv": float(price_cv),
                 "min_price_variance": min_price_variance,
                 "min_r2_threshold": min_r2_threshold,
@@ -148,14 +142,11 @@ async def estimate_elasticity(
             "r2": float(r2),
             "confidence": confidence,
             "model_run_id": str(model_run.id),
-            "data_points": len(df),
+            "data_points": data_points,
             "price_cv": float(price_cv),
             "window_days": window_days
         }
         
-    except np.linalg.LinAlgError as e:
-        logger.error(f"Linear algebra error in elasticity calculation: {e}")
-        raise ValueError("Failed to calculate elasticity: insufficient price variation")
     except Exception as e:
         logger.error(f"Unexpected error in elasticity calculation: {e}")
         raise
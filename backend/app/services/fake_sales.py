@@ -1,17 +1,12 @@
 import asyncio 
-from datetime import  datetime, timezone, timedelta
-import random
-import json 
-from sqlalchemy import future
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession 
+from datetime import  datetime, timezone
+import numpy as np
+import orjson
 from uuid import uuid4 
-from sqlalchemy.orm import  sessionmaker 
 from app.models.sales import RawSales 
-from app.core.db import DATABASE_URL 
+from app.core.db import async_engine
 
-# Configure async engine and session 
-engine=create_async_engine(DATABASE_URL, echo=False, future=True)
-async_session=sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+RAW_SALES_COLUMNS=["source", "status", "error_message", "raw_json"]
 
 # Synthetic data settings-- 
 NUM_RECORDS=1_000_000 # total records to generate 
@@ -20,46 +15,53 @@ NUM_PRODUCTS=500 # number of unique products
 
 START_DATE=datetime(2024, 1, 1, tzinfo=timezone.utc)
 
-def generate_fake_sales(product_ids):
-        # Generate a single fake sales row JSON 
-    product_id=random.choice(product_ids)
-    sale_date=START_DATE+timedelta(days=random.randint(0, 600))
-    units_sold=max(1, int(random.gauss(20, 5))) # normal distribution 
-    price=round(random.uniform(5,100), 2)
+def generate_fake_sales(rng, product_ids, size):
+    # Generate `size` fake sales rows as JSON-ready dicts; every column is drawn
+    # in one vectorized call instead of per-row random.* calls
+    product_idx=rng.integers(0, len(product_ids), size)
+    days=rng.integers(0, 601, size) # 0..600 days after START_DATE
+    units_sold=np.maximum(1, rng.normal(20, 5, size).astype(np.int64)) # normal distribution 
+    prices=np.round(rng.uniform(5, 100, size), 2)
     
     # Sometimes insert some outliers 
-    if random.random()<0.01:
-        units_sold*=random.randint(5,20)
-        
-    data= {
-        "product_id":str(product_id),
-        "date":sale_date.date().isoformat(),
-        "units_sold":units_sold, 
-        "price":price, 
-        "revenue":round(units_sold*price, 2)
-    }
+    outliers=rng.random(size)<0.01
+    units_sold[outliers]*=rng.integers(5, 21, outliers.sum())
     
-    return data 
+    sale_dates=(np.datetime64(START_DATE.date())+days).astype(str)
+    revenue=np.round(units_sold*prices, 2)
+    
+    # .tolist() hands back native Python values for orjson
+    return [
+        {
+            "product_id":product_ids[i],
+            "date":d,
+            "units_sold":u, 
+            "price":p, 
+            "revenue":r
+        }
+        for i, d, u, p, r in zip(
+            product_idx.tolist(), sale_dates.tolist(), units_sold.tolist(), prices.tolist(), revenue.tolist()
+        )
+    ]
 
 async def generate_sales():
-    product_ids=[uuid4() for _ in range(NUM_PRODUCTS)]
+    product_ids=[str(uuid4()) for _ in range(NUM_PRODUCTS)]
+    rng=np.random.default_rng()
     
-    async with async_session() as session: 
-        for batch_start in range(0, NUM_RECORDS, BATCH_SIZE):
-            batch=[] 
-            for _ in range(BATCH_SIZE):
-                sale=generate_fake_sales(product_ids)
-                batch.append(
-                    RawSales(
-                        raw_json=json.dumps(sale),
-                        source="synthetic", 
-                        status="pending",
-                        error_message=None,
-                    )
-                )
-            session.add_all(batch)
-            await session.commit() 
-            print(f"Inserted {batch_start+BATCH_SIZE}/{NUM_RECORDS} rows ...")
+    for batch_start in range(0, NUM_RECORDS, BATCH_SIZE):
+        records=[
+            ("synthetic", "pending", None, orjson.dumps(sale).decode())
+            for sale in generate_fake_sales(rng, product_ids, BATCH_SIZE)
+        ]
+        # One transaction per batch; COPY goes through the raw asyncpg connection,
+        # so no ORM objects are built and raw_json is sent as ready-made JSON text
+        async with async_engine.begin() as conn:
+            raw=await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                RawSales.__tablename__, records=records, columns=RAW_SALES_COLUMNS
+            )
+        print(f"Inserted {batch_start+BATCH_SIZE}/{NUM_RECORDS} rows ...")
+    await async_engine.dispose()
 
 if __name__=="__main__":
     asyncio.run(generate_sales())
\ No newline at end of file
@@ -10,10 +10,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from app.models.sales import SalesDaily
 from app.models.ml import ModelRun, Forecast
+from app.core.db import insert_records
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import uuid4
+from collections import OrderedDict
+import asyncio
+import hashlib
 import logging
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +33,216 @@ except ImportError:
     LIGHTGBM_AVAILABLE = False
     logger.warning("LightGBM not available. Install with: pip install lightgbm")
 
+try:
+    from numba import njit
+except ImportError:
+    # Same kernel as plain Python: identical results, just slower
+    logger.warning("Numba not available, feature engineering runs unjitted. Install with: pip install numba")
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+LGBM_PARAMS = {
+    "objective": "regression",
+    "learning_rate": 0.1,
+    "num_leaves": 31,
+    "max_depth": 6,
+    "seed": 42,
+    "deterministic": True,
+    "verbose": -1,
+}
+LGBM_NUM_BOOST_ROUND = 100
+
+FORECAST_COLUMNS = ("product_id", "model_run_id", "target_date", "predicted_units")
+
+# Trained boosters per (product, training data); repeat forecasts for an unchanged
+# sales history skip the fit and only predict
+MODEL_CACHE_SIZE = int(os.getenv("FORECAST_MODEL_CACHE_SIZE", "128"))
+_model_cache: "OrderedDict[tuple, lgb.Booster]" = OrderedDict()
+_model_cache_lock = threading.Lock()  # training runs in worker threads
+
+# Feature windows; column order below is the model's feature order
+LAGS = np.array([1, 7, 14, 28], dtype=np.int64)
+WINDOWS = np.array([7, 14, 28], dtype=np.int64)
+
+LAG_MA_COLUMNS = (
+    [name for lag in LAGS for name in (f'units_sold_lag_{lag}', f'price_lag_{lag}')]
+    + [name for window in WINDOWS for name in (f'units_sold_ma_{window}', f'price_ma_{window}')]
+    + ['price_change', 'price_change_lag_1']
+)
+CALENDAR_COLUMNS = ['day_of_week', 'month', 'day_of_month']
+FEATURE_COLUMNS = ['price'] + CALENDAR_COLUMNS + LAG_MA_COLUMNS
+
+# Trailing days needed for every lag/MA feature of the newest day
+LOOKBACK = int(max(LAGS.max(), WINDOWS.max())) + 1
+
+
+@njit(cache=True)
+def _lag_ma_features(units, price, lags, windows, out):
+    """
+    Lags, trailing means and price change for date-sorted series in one pass.
+    
+    Matches shift(lag), rolling(window, min_periods=1).mean(), pct_change() and its
+    shift(1): undefined leading values are NaN. Trailing means keep a running sum
+    per window (add the new value, subtract the one leaving the window).
+    
+    Writes into `out` (n x len(LAG_MA_COLUMNS), typically a float32 view of the
+    feature matrix); sums are accumulated in float64, only stored values are rounded.
+    """
+    n = units.shape[0]
+    n_lags = lags.shape[0]
+    n_windows = windows.shape[0]
+    out[:, :] = np.nan
+    units_sums = np.zeros(n_windows)
+    price_sums = np.zeros(n_windows)
+    change_col = 2 * n_lags + 2 * n_windows
+    
+    for i in range(n):
+        for j in range(n_lags):
+            lag = lags[j]
+            if i >= lag:
+                out[i, 2 * j] = units[i - lag]
+                out[i, 2 * j + 1] = price[i - lag]
+        
+        for j in range(n_windows):
+            window = windows[j]
+            units_sums[j] += units[i]
+            price_sums[j] += price[i]
+            if i >= window:
+                units_sums[j] -= units[i - window]
+                price_sums[j] -= price[i - window]
+            count = min(i + 1, window)
+            out[i, 2 * n_lags + 2 * j] = units_sums[j] / count
+            out[i, 2 * n_lags + 2 * j + 1] = price_sums[j] / count
+        
+        if i >= 1:
+            previous = price[i - 1]
+            if previous != 0:
+                out[i, change_col] = (price[i] - previous) / previous
+            elif price[i] > 0:
+                out[i, change_col] = np.inf
+            elif price[i] < 0:
+                out[i, change_col] = -np.inf
+            # 0 -> 0 stays NaN, as in pandas
+        if i >= 2:
+            out[i, change_col + 1] = out[i - 1, change_col]
+
+
+def _train_booster(product_id: str, X_train: np.ndarray, y_train: np.ndarray, feature_cols: List[str]):
+    """
+    Train a booster, or return the cached one for identical training data.
+    
+    The key hashes the feature matrix and labels, so any new or corrected sales
+    row (or a different test_days split) trains a fresh model.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(np.ascontiguousarray(X_train))
+    hasher.update(np.ascontiguousarray(y_train))
+    key = (str(product_id), tuple(feature_cols), hasher.digest())
+    
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is not None:
+            _model_cache.move_to_end(key)
+            return model
+    
+    # Trained outside the lock, so other products keep training meanwhile
+    train_set = lgb.Dataset(X_train, label=y_train, feature_name=feature_cols, free_raw_data=True)
+    model = lgb.train(LGBM_PARAMS, train_set, num_boost_round=LGBM_NUM_BOOST_ROUND)
+    
+    with _model_cache_lock:
+        _model_cache[key] = model
+        if len(_model_cache) > MODEL_CACHE_SIZE:
+            _model_cache.popitem(last=False)
+    return model
+
+
+def _calendar_features(dates: np.ndarray, out: np.ndarray) -> None:
+    """
+    Write day of week (Monday=0), month and day of month for datetime64[D] dates
+    into the three columns of `out`.
+    """
+    months = dates.astype('datetime64[M]')
+    out[:, 0] = (dates.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    out[:, 1] = months.astype(np.int64) % 12 + 1
+    out[:, 2] = (dates - months).astype(np.int64) + 1
+
+
+def engineer_features_np(
+    units: np.ndarray,
+    price: np.ndarray,
+    dates: np.ndarray
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Engineer features from date-sorted 1-D arrays, without a DataFrame.
+    
+    Args:
+        units: Units sold per day
+        price: Price per day
+        dates: Days as datetime64[D]
+        
+    Returns:
+        Tuple of (float32 feature matrix with one row per day, FEATURE_COLUMNS).
+        Rows without a full lag history contain NaN; callers drop them.
+    """
+    X = np.empty((len(dates), len(FEATURE_COLUMNS)), dtype=np.float32)
+    X[:, 0] = price
+    _calendar_features(dates, X[:, 1:1 + len(CALENDAR_COLUMNS)])
+    
+    # Lag, moving average and price change features, computed in one pass over
+    # the raw arrays instead of one pandas column operation per feature, written
+    # straight into the float32 matrix (no float64 temporary)
+    _lag_ma_features(
+        np.ascontiguousarray(units, dtype=np.float64),
+        np.ascontiguousarray(price, dtype=np.float64),
+        LAGS,
+        WINDOWS,
+        X[:, 1 + len(CALENDAR_COLUMNS):],
+    )
+    return X, FEATURE_COLUMNS
+
+
+def _recursive_forecast(model, units: np.ndarray, prices: np.ndarray, future_dates: np.ndarray) -> np.ndarray:
+    """
+    Predict the horizon one day at a time, feeding each prediction back into the
+    lag and moving-average features of the following days.
+    
+    Price is held at the last known value. Each day's features are built by the
+    same kernel as the training rows, over the trailing LOOKBACK days; the moving
+    averages include the day itself, so its units are provisionally the previous
+    day's until the model has predicted them.
+    
+    Returns:
+        Non-negative predicted units per future date
+    """
+    horizon = len(future_dates)
+    history_units = np.concatenate([units[-LOOKBACK:], np.zeros(horizon)])
+    history_price = np.concatenate([prices[-LOOKBACK:], np.full(horizon, prices[-1])])
+    
+    X_future = np.empty((horizon, len(FEATURE_COLUMNS)), dtype=np.float32)
+    X_future[:, 0] = prices[-1]
+    _calendar_features(future_dates, X_future[:, 1:1 + len(CALENDAR_COLUMNS)])
+    
+    predictions = np.empty(horizon)
+    window_features = np.empty((LOOKBACK, len(LAG_MA_COLUMNS)), dtype=np.float32)  # reused each step
+    for t in range(horizon):
+        i = LOOKBACK + t
+        history_units[i] = history_units[i - 1]
+        window = slice(i - LOOKBACK + 1, i + 1)
+        _lag_ma_features(history_units[window], history_price[window], LAGS, WINDOWS, window_features)
+        X_future[t, 1 + len(CALENDAR_COLUMNS):] = window_features[-1]
+        predictions[t] = history_units[i] = max(0.0, model.predict(X_future[t:t + 1])[0])
+    
+    return predictions
+
 
 def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Engineer features for forecasting: lags, moving averages, calendar features.
+    DataFrame wrapper around engineer_features_np for ad-hoc analysis.
     
     Args:
         df: DataFrame with columns ['date', 'units_sold', 'price']
@@ -38,34 +250,24 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with engineered features
     """
-    df = df.copy()
-    
-    # Sort by date
-    df = df.sort_values('date').reset_index(drop=True)
-    
-    # Calendar features
-    df['day_of_week'] = df['date'].dt.dayofweek
-    df['month'] = df['date'].dt.month
-    df['day_of_month'] = df['date'].dt.day
-    
-    # Lag features (1, 7, 14, 28 days)
-    for lag in [1, 7, 14, 28]:
-        df[f'units_sold_lag_{lag}'] = df['units_sold'].shift(lag)
-        df[f'price_lag_{lag}'] = df['price'].shift(lag)
-    
-    # Moving averages (7, 14, 28 days)
-    for window in [7, 14, 28]:
-        df[f'units_sold_ma_{window}'] = df['units_sold'].rolling(window=window, min_periods=1).mean()
-        df[f'price_ma_{window}'] = df['price'].rolling(window=window, min_periods=1).mean()
-    
-    # Price change features
-    df['price_change'] = df['price'].pct_change()
-    df['price_change_lag_1'] = df['price_change'].shift(1)
+    # Sort by date, only when needed (the input is never modified, so no copy)
+    if not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', ignore_index=True, kind='stable')
+    
+    X, feature_cols = engineer_features_np(
+        df['units_sold'].to_numpy(dtype=np.float64),
+        df['price'].to_numpy(dtype=np.float64),
+        df['date'].to_numpy(dtype='datetime64[D]'),
+    )
+    df = pd.concat(
+        [df[['date', 'units_sold']], pd.DataFrame(X, columns=feature_cols, index=df.index)], axis=1
+    )
     
     # Remove rows with NaN values (from lag calculations)
-    df = df.dropna()
+    df = df[~np.isnan(X).any(axis=1)]
     
-    return df
+    # Calendar columns are small integers (the model still gets them as float32)
+    return df.astype({col: np.int8 for col in CALENDAR_COLUMNS})
 
 
 async def run_forecast(
@@ -104,85 +306,51 @@ async def run_forecast(
     if len(sales_data) < min_data_days:
         raise ValueError(f"Insufficient data: only {len(sales_data)} days found, need {min_data_days}")
     
-    # Convert to DataFrame
-    df = pd.DataFrame(sales_data, columns=['date', 'units_sold', 'price'])
-    df['date'] = pd.to_datetime(df['date'])
-    
-   
-    # Engineer features
-    df_features = engineer_features(df)
-    
-    import logging
-
-    for col in df_features.columns:
-        if col not in ['date', "units_sold"]:
-            original_nonnull = df_features[col].notnull().sum()
-            df_features[col] = pd.to_numeric(df_features[col], errors="coerce")
-            coerced_nans = df_features[col].isna().sum() - (df_features[col].shape[0] - original_nonnull)
-            if coerced_nans > 0:
-                logging.warning(
-                    f"Column '{col}' had {coerced_nans} values coerced to NaN during numeric conversion. "
-                    "Check for unexpected data types or values."
-                )
-    
-    if len(df_features) < min_data_days:
-        raise ValueError(f"Insufficient data after feature engineering: {len(df_features)} rows")
-    
-    # Split into train/test
-    split_idx = len(df_features) - test_days
-    train_df = df_features.iloc[:split_idx]
-    test_df = df_features.iloc[split_idx:]
-    
-    # Feature columns (exclude target and date)
-    feature_cols = [col for col in df_features.columns 
-                    if col not in ['date', 'units_sold']]
-    
-    X_train = train_df[feature_cols]
-    y_train = train_df['units_sold']
-    X_test = test_df[feature_cols]
-    y_test = test_df['units_sold']
-    
-    # Train LightGBM model
-    model = lgb.LGBMRegressor(
-        n_estimators=100,
-        learning_rate=0.1,
-        max_depth=6,
-        random_state=42,
-        verbose=-1
-    )
-    
-    model.fit(X_train, y_train)
+    # One 1-D array per column (numeric columns come back as Decimal; converted once).
+    # ORDER BY date above is what the lag features rely on, so no re-sort here
+    dates, units, prices = zip(*sales_data)
+    dates = np.array(dates, dtype='datetime64[D]')
+    units = np.array(units, dtype=np.float64)
+    prices = np.array(prices, dtype=np.float64)
+    
+    # Engineer features, keeping the days with a full lag history
+    X, feature_cols = engineer_features_np(units, prices, dates)
+    valid = ~np.isnan(X).any(axis=1)
+    X, y = X[valid], units[valid]
+    
+    if len(X) < min_data_days:
+        raise ValueError(f"Insufficient data after feature engineering: {len(X)} rows")
+    
+    # Split into train/test. Features are float32 already: LightGBM bins them into
+    # uint8/uint16 anyway, so float32 loses nothing and halves the memory the
+    # histogram pass reads
+    split_idx = len(X) - test_days
+    X_train, X_test = X[:split_idx], X[split_idx:]
+    y_train = y[:split_idx].astype(np.float32)
+    y_test = y[split_idx:]
+    
+    # Train LightGBM model (same settings the LGBMRegressor defaults gave). Fit and
+    # predict run in a worker thread: LightGBM releases the GIL, so the event loop
+    # keeps serving requests and other products' queries meanwhile
+    model = await asyncio.to_thread(_train_booster, product_id, X_train, y_train, feature_cols)
     
     # Evaluate on test set
-    y_pred_test = model.predict(X_test)
-    
-    # Calculate MAPE
-    mape = np.mean(np.abs((y_test - y_pred_test) / y_test)) * 100
+    y_pred_test = await asyncio.to_thread(model.predict, X_test)
+    
+    # Calculate MAPE over the days with sales: a zero-sale day has no percentage
+    # error (it divided by zero and turned the whole metric into inf/NaN).
+    # None when every test day is zero, since NaN is not valid JSON
+    nonzero = y_test != 0
+    mape = (
+        float(np.mean(np.abs(1.0 - y_pred_test[nonzero] / y_test[nonzero])) * 100)
+        if nonzero.any() else None
+    )
     
-    # Generate future predictions
-    last_date = df_features['date'].max()
-    future_dates = [last_date + timedelta(days=i+1) for i in range(horizon)]
+    # Generate future predictions, from the day after the last sale
+    future_dates = dates[-1] + np.arange(1, horizon + 1)
     
-    # Create future feature matrix (using last known values)
-    last_row = df_features.iloc[-1]
-    future_features = []
-    
-    for future_date in future_dates:
-        # Create feature row for future date
-        future_row = last_row.copy()
-        future_row['date'] = future_date
-        
-        # Update calendar features
-        future_row['day_of_week'] = future_date.dayofweek
-        future_row['month'] = future_date.month
-        future_row['day_of_month'] = future_date.day
-        
-        # For now, use last known values for lag/MA features
-        # In production, you'd want to update these as you predict forward
-        future_features.append(future_row[feature_cols].values)
-    
-    X_future = np.array(future_features)
-    future_predictions = model.predict(X_future)
+    # Recursive multi-step forecast (fit and predict both in a worker thread, see above)
+    future_predictions = await asyncio.to_thread(_recursive_forecast, model, units, prices, future_dates)
     
     # Store model run
     model_run = ModelRun(
@@ -196,39 +364,33 @@ async def run_forecast(
             "feature_count": len(feature_cols),
             "train_samples": len(X_train),
             "test_samples": len(X_test),
-            "mape": float(mape)
+            "mape": mape
         }
     )
     session.add(model_run)
     await session.flush()
     
-    # Store forecasts
-    forecasts = []
-    for i, (future_date, prediction) in enumerate(zip(future_dates, future_predictions)):
-        forecast = Forecast(
-            product_id=product_id,
-            model_run_id=model_run.id,
-            target_date=future_date.date(),
-            predicted_units=float(max(0, prediction))  # Ensure non-negative
-        )
-        forecasts.append(forecast)
-    
-    session.add_all(forecasts)
+    # Store forecasts as plain rows (COPY for long horizons, no ORM objects)
+    forecasts = [
+        (product_id, model_run.id, future_date, prediction)  # non-negative already
+        for future_date, prediction in zip(future_dates.tolist(), future_predictions.tolist())
+    ]
+    await insert_records(session, Forecast.__table__, FORECAST_COLUMNS, forecasts)
     await session.commit()
     
     return {
         "model_run_id": str(model_run.id),
         "horizon": horizon,
-        "mape": float(mape),
+        "mape": mape,
         "forecasts": [
             {
-                "date": f.date().isoformat(),
+                "date": f.isoformat(),
                 "predicted_units": float(pred)
             }
-            for f, pred in zip(future_dates, future_predictions)
+            for f, pred in zip(future_dates.tolist(), future_predictions)
         ],
         "feature_importance": {
-            col: int(imp) for col, imp in zip(feature_cols, model.feature_importances_)
+            col: int(imp) for col, imp in zip(feature_cols, model.feature_importance(importance_type="split"))
         }
     }
 
@@ -251,7 +413,14 @@ async def get_forecasts(
     Returns:
         List of forecast records
     """
-    query = select(Forecast).where(Forecast.product_id == product_id)
+    # Columns only: rows come back as tuples, no ORM objects to build and track
+    query = select(
+        Forecast.id,
+        Forecast.target_date,
+        Forecast.predicted_units,
+        Forecast.model_run_id,
+        Forecast.created_at
+    ).where(Forecast.product_id == product_id)
     
     if from_date:
         query = query.where(Forecast.target_date >= from_date)
@@ -261,7 +430,7 @@ async def get_forecasts(
     query = query.order_by(Forecast.target_date)
     
     result = await session.execute(query)
-    forecasts = result.scalars().all()
+    forecasts = result.all()
     
     return [
         {
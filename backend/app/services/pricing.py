@@ -7,10 +7,11 @@ Write suggested_prices including expected units/revenue/profit.
 
 import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, bindparam
 from app.models.sales import SalesDaily, Cost
 from app.models.ml import ModelRun, PriceRecommendation, Forecast, ElasticityEstimate
 from app.models.product import Product
+from app.core.db import insert_records
 from datetime import date, timedelta
 from typing import List, Optional, Tuple
 from uuid import uuid4
@@ -19,13 +20,42 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _latest(column, order_by):
+    # Newest value of `column` for the product bound as :product_id; the id
+    # tie-break keeps columns read from the same table on the same row
+    model = order_by.class_
+    return (
+        select(column)
+        .where(model.product_id == bindparam("product_id"))
+        .order_by(order_by.desc(), model.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+# Everything recommend_prices needs before optimizing, in one round trip: each
+# column is an index lookup, NULL when the product/estimate/sales/cost is missing
+PRICING_INPUTS = select(
+    select(Product.id).where(Product.id == bindparam("product_id")).scalar_subquery().label("product_id"),
+    _latest(ElasticityEstimate.elasticity, ElasticityEstimate.created_at).label("elasticity"),
+    _latest(ElasticityEstimate.r2, ElasticityEstimate.created_at).label("r2"),
+    _latest(SalesDaily.price, SalesDaily.date).label("price"),
+    _latest(SalesDaily.units_sold, SalesDaily.date).label("units_sold"),
+    _latest(Cost.unit_cost, Cost.date).label("unit_cost"),
+)
+
+RECOMMENDATION_COLUMNS = (
+    "product_id", "model_run_id", "target_date", "objective",
+    "suggested_price", "expected_units", "expected_revenue", "expected_profit",
+)
+
+
 def calculate_demand_curve(
     baseline_price: float,
     baseline_quantity: float,
     elasticity: float,
     price_range: Tuple[float, float],
     num_points: int = 100
-) -> Tuple[List[float], List[float]]:
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Calculate demand curve using elasticity: D(p) = D0 * (p/P0)^b
     
@@ -37,7 +67,7 @@ def calculate_demand_curve(
         num_points: Number of price points to evaluate
         
     Returns:
-        Tuple of (prices, quantities)
+        Tuple of (prices, quantities) as arrays
     """
     min_price, max_price = price_range
     prices = np.linspace(min_price, max_price, num_points)
@@ -45,12 +75,12 @@ def calculate_demand_curve(
     # Demand curve: D(p) = D0 * (p/P0)^b
     quantities = baseline_quantity * (prices / baseline_price) ** elasticity
     
-    return prices.tolist(), quantities.tolist()
+    return prices, quantities
 
 
 def optimize_price_objective(
-    prices: List[float],
-    quantities: List[float],
+    prices: np.ndarray,
+    quantities: np.ndarray,
     objective: str,
     unit_cost: Optional[float] = None
 ) -> Tuple[float, float, float, float]:
@@ -58,8 +88,8 @@ def optimize_price_objective(
     Find optimal price for given objective (revenue or profit).
     
     Args:
-        prices: List of price points
-        quantities: List of corresponding quantities
+        prices: Array of price points
+        quantities: Array of corresponding quantities
         objective: 'revenue' or 'profit'
         unit_cost: Cost per unit (required for profit optimization)
         
@@ -68,12 +98,12 @@ def optimize_price_objective(
     """
     if objective == 'revenue':
         # Maximize R(p) = p * D(p)
-        revenues = [p * q for p, q in zip(prices, quantities)]
-        max_idx = np.argmax(revenues)
+        revenues = prices * quantities
+        max_idx = int(np.argmax(revenues))
         
-        optimal_price = prices[max_idx]
-        optimal_quantity = quantities[max_idx]
-        expected_revenue = revenues[max_idx]
+        optimal_price = float(prices[max_idx])
+        optimal_quantity = float(quantities[max_idx])
+        expected_revenue = float(revenues[max_idx])
         expected_profit = None  # Not calculated for revenue objective
         
     elif objective == 'profit':
@@ -81,13 +111,13 @@ def optimize_price_objective(
             raise ValueError("unit_cost required for profit optimization")
             
         # Maximize π(p) = (p-c) * D(p)
-        profits = [(p - unit_cost) * q for p, q in zip(prices, quantities)]
-        max_idx = np.argmax(profits)
+        profits = (prices - unit_cost) * quantities
+        max_idx = int(np.argmax(profits))
         
-        optimal_price = prices[max_idx]
-        optimal_quantity = quantities[max_idx]
+        optimal_price = float(prices[max_idx])
+        optimal_quantity = float(quantities[max_idx])
         expected_revenue = optimal_price * optimal_quantity
-        expected_profit = profits[max_idx]
+        expected_profit = float(profits[max_idx])
         
     else:
         raise ValueError("objective must be 'revenue' or 'profit'")
@@ -95,6 +125,63 @@ def optimize_price_objective(
     return optimal_price, optimal_quantity, expected_revenue, expected_profit
 
 
+def analytic_optimal_price(
+    baseline_price: float,
+    baseline_quantity: float,
+    elasticity: float,
+    pmin: float,
+    pmax: float,
+    objective: str,
+    unit_cost: Optional[float] = None
+) -> Tuple[float, float, float, Optional[float]]:
+    """
+    Exact optimum of the constant-elasticity demand curve on [pmin, pmax].
+    
+    Revenue p*D(p) is monotone in p, so its optimum is a bound. Profit (p-c)*D(p)
+    peaks at p* = c*b/(b+1) when b < -1 and otherwise grows with p. Evaluating the
+    bounds plus the clipped p* replaces the grid search with O(1) work per date.
+    
+    Args:
+        baseline_price: Current/reference price P0
+        baseline_quantity: Current/reference quantity D0
+        elasticity: Price elasticity b (typically negative)
+        pmin: Minimum price
+        pmax: Maximum price
+        objective: 'revenue' or 'profit'
+        unit_cost: Cost per unit (required for profit optimization)
+        
+    Returns:
+        Tuple of (optimal_price, optimal_quantity, expected_revenue, expected_profit),
+        as optimize_price_objective
+    """
+    if objective == 'revenue':
+        cost = 0.0
+        candidates = [pmin, pmax]
+    elif objective == 'profit':
+        if unit_cost is None:
+            raise ValueError("unit_cost required for profit optimization")
+        cost = unit_cost
+        candidates = [pmin, pmax]
+        if elasticity < -1:
+            p_star = unit_cost * elasticity / (elasticity + 1.0)
+            candidates.insert(1, min(max(p_star, pmin), pmax))
+    else:
+        raise ValueError("objective must be 'revenue' or 'profit'")
+    
+    # Candidates are in ascending price order, so ties go to the lower price as with argmax
+    best_value, optimal_price, optimal_quantity = None, None, None
+    for price in candidates:
+        quantity = baseline_quantity * (price / baseline_price) ** elasticity
+        value = (price - cost) * quantity
+        if best_value is None or value > best_value:
+            best_value, optimal_price, optimal_quantity = value, price, quantity
+    
+    expected_revenue = optimal_price * optimal_quantity
+    expected_profit = float(best_value) if objective == 'profit' else None
+    
+    return float(optimal_price), float(optimal_quantity), float(expected_revenue), expected_profit
+
+
 async def recommend_prices(
     session: AsyncSession,
     product_id: str,
@@ -120,43 +207,23 @@ async def recommend_prices(
         dict with price recommendations and model metadata
     """
     
-    # Get product info
-    product_result = await session.execute(
-        select(Product).where(Product.id == product_id)
-    )
-    product = product_result.scalar_one_or_none()
+    # Product, latest elasticity estimate, latest sales and latest cost in one query
+    inputs = (await session.execute(PRICING_INPUTS, {"product_id": product_id})).one()
     
-    if not product:
+    if inputs.product_id is None:
         raise ValueError(f"Product {product_id} not found")
     
-    # Get latest elasticity estimate
-    elasticity_result = await session.execute(
-        select(ElasticityEstimate)
-        .where(ElasticityEstimate.product_id == product_id)
-        .order_by(ElasticityEstimate.created_at.desc())
-        .limit(1)
-    )
-    elasticity_estimate = elasticity_result.scalar_one_or_none()
-    
-    if not elasticity_estimate:
+    if inputs.elasticity is None:
         raise ValueError(f"No elasticity estimate found for product {product_id}")
     
-    elasticity = float(elasticity_estimate.elasticity)
-    
-    # Get latest sales data for baseline
-    latest_sales_result = await session.execute(
-        select(SalesDaily.price, SalesDaily.units_sold)
-        .where(SalesDaily.product_id == product_id)
-        .order_by(SalesDaily.date.desc())
-        .limit(1)
-    )
-    latest_sales = latest_sales_result.fetchone()
+    elasticity = float(inputs.elasticity)
     
-    if not latest_sales:
+    # Latest sales data for baseline
+    if inputs.price is None:
         raise ValueError(f"No sales data found for product {product_id}")
     
-    baseline_price = float(latest_sales.price)
-    baseline_quantity = float(latest_sales.units_sold)
+    baseline_price = float(inputs.price)
+    baseline_quantity = float(inputs.units_sold)
     
     # Set price bounds if not provided
     if pmin is None:
@@ -170,18 +237,11 @@ async def recommend_prices(
     if pmin <= 0:
         raise ValueError("pmin must be positive")
     
-    # Get unit cost if optimizing for profit
+    # Unit cost if optimizing for profit
     unit_cost = None
     if objective == "profit":
-        cost_result = await session.execute(
-            select(Cost.unit_cost)
-            .where(Cost.product_id == product_id)
-            .order_by(Cost.date.desc())
-            .limit(1)
-        )
-        cost_row = cost_result.fetchone()
-        if cost_row:
-            unit_cost = float(cost_row.unit_cost)
+        if inputs.unit_cost is not None:
+            unit_cost = float(inputs.unit_cost)
         else:
             logger.warning(f"No cost data found for product {product_id}, using 0")
             unit_cost = 0.0
@@ -192,15 +252,19 @@ async def recommend_prices(
         start_date = date.today() + timedelta(days=1)
         target_dates = [start_date + timedelta(days=i) for i in range(horizon)]
     
-    # Get forecasts for target dates
+    # Get forecasts for target dates. Oldest first, so when several runs forecast
+    # the same date the newest one ends up in the dict
     forecasts_result = await session.execute(
         select(Forecast.target_date, Forecast.predicted_units)
         .where(
             Forecast.product_id == product_id,
             Forecast.target_date.in_(target_dates)
         )
+        .order_by(Forecast.id)
     )
-    forecasts = {f.target_date: f.predicted_units for f in forecasts_result.scalars().all()}
+    # Rows, not .scalars(): that kept only target_date, so every date fell back to
+    # the baseline quantity. Numeric comes back as Decimal; the maths below is float
+    forecasts = {f.target_date: float(f.predicted_units) for f in forecasts_result}
     
     # Store model run
     model_run = ModelRun(
@@ -214,7 +278,7 @@ async def recommend_prices(
             "baseline_price": baseline_price,
             "baseline_quantity": baseline_quantity,
             "elasticity": elasticity,
-            "elasticity_r2": float(elasticity_estimate.r2),
+            "elasticity_r2": float(inputs.r2),
             "unit_cost": unit_cost,
             "target_dates": [d.isoformat() for d in target_dates],
             "horizon": horizon
@@ -223,6 +287,19 @@ async def recommend_prices(
     session.add(model_run)
     await session.flush()
     
+    # D(p) scales linearly with the forecast D0, so the optimal price is the same for
+    # every date: solve once for a unit forecast, then scale units/revenue/profit.
+    # (Forecasts and baseline quantities are non-negative, so the argmax is unchanged.)
+    optimal_price, unit_quantity, unit_revenue, unit_profit = analytic_optimal_price(
+        baseline_price=baseline_price,
+        baseline_quantity=1.0,
+        elasticity=elasticity,
+        pmin=pmin,
+        pmax=pmax,
+        objective=objective,
+        unit_cost=unit_cost
+    )
+    
     # Generate price recommendations for each target date
     recommendations = []
     
@@ -230,38 +307,24 @@ async def recommend_prices(
         # Use forecasted quantity or baseline if no forecast
         forecasted_quantity = forecasts.get(target_date, baseline_quantity)
         
-        # Calculate demand curve
-        prices, quantities = calculate_demand_curve(
-            baseline_price=baseline_price,
-            baseline_quantity=forecasted_quantity,
-            elasticity=elasticity,
-            price_range=(pmin, pmax)
-        )
-        
-        # Find optimal price
-        optimal_price, optimal_quantity, expected_revenue, expected_profit = optimize_price_objective(
-            prices=prices,
-            quantities=quantities,
-            objective=objective,
-            unit_cost=unit_cost
-        )
-        
-        # Create recommendation record
-        recommendation = PriceRecommendation(
-            product_id=product_id,
-            model_run_id=model_run.id,
-            target_date=target_date,
-            objective=objective,
-            suggested_price=optimal_price,
-            expected_units=optimal_quantity,
-            expected_revenue=expected_revenue,
-            expected_profit=expected_profit if expected_profit is not None else 0.0
-        )
-        recommendations.append(recommendation)
+        optimal_quantity = forecasted_quantity * unit_quantity
+        expected_revenue = forecasted_quantity * unit_revenue
+        expected_profit = forecasted_quantity * unit_profit if unit_profit is not None else None
         
-        # Store in database
-        session.add(recommendation)
+        # Recommendation row, in RECOMMENDATION_COLUMNS order
+        recommendations.append((
+            product_id,
+            model_run.id,
+            target_date,
+            objective,
+            optimal_price,
+            optimal_quantity,
+            expected_revenue,
+            expected_profit if expected_profit is not None else 0.0
+        ))
     
+    # Store in database as one bulk insert (COPY for long horizons)
+    await insert_records(session, PriceRecommendation.__table__, RECOMMENDATION_COLUMNS, recommendations)
     await session.commit()
     
     return {
@@ -272,13 +335,14 @@ async def recommend_prices(
         "price_range": {"min": pmin, "max": pmax},
         "recommendations": [
             {
-                "target_date": r.target_date.isoformat(),
-                "suggested_price": float(r.suggested_price),
-                "expected_units": float(r.expected_units),
-                "expected_revenue": float(r.expected_revenue),
-                "expected_profit": float(r.expected_profit)
+                "target_date": target_date.isoformat(),
+                "suggested_price": float(suggested_price),
+                "expected_units": float(expected_units),
+                "expected_revenue": float(expected_revenue),
+                "expected_profit": float(expected_profit)
             }
-            for r in recommendations
+            for _, _, target_date, _, suggested_price, expected_units, expected_revenue, expected_profit
+            in recommendations
         ]
     }
 
@@ -303,7 +367,18 @@ async def get_price_recommendations(
     Returns:
         List of price recommendation records
     """
-    query = select(PriceRecommendation).where(PriceRecommendation.product_id == product_id)
+    # Columns only: rows come back as tuples, no ORM objects to build and track
+    query = select(
+        PriceRecommendation.id,
+        PriceRecommendation.target_date,
+        PriceRecommendation.objective,
+        PriceRecommendation.suggested_price,
+        PriceRecommendation.expected_units,
+        PriceRecommendation.expected_revenue,
+        PriceRecommendation.expected_profit,
+        PriceRecommendation.model_run_id,
+        PriceRecommendation.created_at
+    ).where(PriceRecommendation.product_id == product_id)
     
     if from_date:
         query = query.where(PriceRecommendation.target_date >= from_date)
@@ -315,7 +390,7 @@ async def get_price_recommendations(
     query = query.order_by(PriceRecommendation.target_date)
     
     result = await session.execute(query)
-    recommendations = result.scalars().all()
+    recommendations = result.all()
     
     return [
         {
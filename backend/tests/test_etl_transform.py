@@ -0,0 +1,56 @@
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from app.etl.etl import transform_batch
+
+Raw = namedtuple("Raw", ["raw_id", "raw_json"])
+
+
+def _row(raw_id, **fields):
+    return Raw(raw_id, {"product_id": str(uuid4()), "date": f"2024-01-{raw_id:02d}", "units_sold": 2, "price": 1.5, **fields})
+
+
+def test_valid_rows_are_normalized():
+    records, processed, failed = transform_batch([_row(1), _row(2, revenue=4)])
+
+    assert processed == [1, 2]
+    assert failed == []
+    assert [r[1:] for r in records] == [
+        (date(2024, 1, 1), 2, Decimal("1.5"), Decimal("3.0")),
+        (date(2024, 1, 2), 2, Decimal("1.5"), Decimal("4")),
+    ]
+
+
+def test_huge_number_fails_only_its_row():
+    rows = [_row(1), _row(2, price=10**400), _row(3, units_sold=10**400), _row(4, revenue=-10**400), _row(5)]
+
+    records, processed, failed = transform_batch(rows)
+
+    assert processed == [1, 5]
+    assert len(records) == 2
+    assert failed == [
+        (2, "price must be a number"),
+        (3, "units_sold must be an integer"),
+        (4, "revenue must be a number"),
+    ]
+
+
+def test_date_must_be_exactly_iso():
+    rows = [_row(1, date="2024-01-15garbage"), _row(2, date="2024-01-15T99:99"), _row(3, date="2024-02-30"), _row(4)]
+
+    records, processed, failed = transform_batch(rows)
+
+    assert processed == [4]
+    assert [raw_id for raw_id, _ in failed] == [1, 2, 3]
+    assert {error for _, error in failed} == {"date must be an ISO date (YYYY-MM-DD)"}
+
+
+def test_null_product_id_is_not_replaced_by_alias():
+    row = Raw(1, {"product_id": None, "productID": str(uuid4()), "units_sold": 1, "price": 1})
+
+    records, processed, failed = transform_batch([row])
+
+    assert records == []
+    assert failed == [(1, "product_id must be a valid UUID")]
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+from app.routers import sales
+
+
+class _FakeDriverConnection:
+    def __init__(self):
+        self.copied = []
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copied.append((table, list(records), columns))
+
+
+class _FakeRawConnection:
+    def __init__(self, driver_connection):
+        self.driver_connection = driver_connection
+
+
+class _FakeConnection:
+    def __init__(self, driver_connection):
+        self._raw = _FakeRawConnection(driver_connection)
+
+    async def get_raw_connection(self):
+        return self._raw
+
+
+class _FakeSession:
+    def __init__(self):
+        self.driver = _FakeDriverConnection()
+        self.committed = False
+
+    async def connection(self):
+        return _FakeConnection(self.driver)
+
+    async def commit(self):
+        self.committed = True
+
+
+async def _no_invalidate():
+    pass
+
+
+def test_upload_keeps_ints_wider_than_64_bits(monkeypatch):
+    monkeypatch.setattr(sales, "invalidate_dashboard_cache", _no_invalidate)
+    db = _FakeSession()
+    rows = [{"price": 10**400, "units_sold": 1}, {"price": 2.5, "units_sold": 3}]
+
+    result = asyncio.run(sales.upload_raw_sales(rows=rows, source="api", db=db))
+
+    assert result == {"inserted": 2}
+    assert db.committed
+    [(table, records, columns)] = db.driver.copied
+    assert table == "raw_sales"
+    assert columns == ["source", "raw_json", "status"]
+    assert [json.loads(raw_json) for _, raw_json, _ in records] == rows